@@ -1,12 +1,18 @@
+from typing import List
+
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
 
+from config import settings
 from container import Container
-from core.schema.auth_schema import SignIn, SignInResponse, SignUp
+from core.dependencies import internal_access
+from core.rate_limit import RateLimiter
+from core.schema.auth_schema import SignIn, SignInResponse, SignUp, TokenIntrospection
 from core.schema.user_schema import User
 from core.services.auth_service import AuthService
 from core.services.oauth_service import GoogleOAuthService, GitHubOAuthService
+from core.services.user_service import UserService
 
 router = APIRouter(
     prefix="/auth",
@@ -16,14 +22,30 @@ router = APIRouter(
 
 @router.post("/signin", response_model=SignInResponse)
 @inject
-async def sign_in(payload: SignIn, service: AuthService = Depends(Provide[Container.auth_service])):
-    return service.sign_in(payload)
+async def sign_in(payload: SignIn, request: Request,
+                  service: AuthService = Depends(Provide[Container.auth_service]),
+                  limiter: RateLimiter = Depends(Provide[Container.auth_rate_limiter])):
+    await limiter.check(ip=request.client and request.client.host, email=payload.email)
+    return await service.sign_in(payload)
 
 
 @router.post("/signup", response_model=User)
 @inject
-async def sign_up(payload: SignUp, service: AuthService = Depends(Provide[Container.auth_service])):
-    return service.sign_up(payload)
+async def sign_up(payload: SignUp, request: Request,
+                  service: AuthService = Depends(Provide[Container.auth_service]),
+                  limiter: RateLimiter = Depends(Provide[Container.auth_rate_limiter])):
+    await limiter.check(ip=request.client and request.client.host, email=payload.email)
+    return await service.sign_up(payload)
+
+
+@router.post("/introspect", response_model=List[TokenIntrospection], dependencies=[Depends(internal_access)])
+@inject
+async def introspect(
+        tokens: List[str] = Body(..., embed=True, max_length=settings.introspect_max_tokens),
+        service: UserService = Depends(Provide[Container.user_service]),
+):
+    """Results come back in the order of ``tokens``; callers authenticate with ``X-Internal-Key``."""
+    return await service.introspect(tokens)
 
 
 @router.get("/google/oauth")
@@ -1,39 +1,130 @@
-from typing import List
+from typing import List, Literal, Optional
 
 from core.dependencies import get_current_user
-from core.security import JWTBearer
+from core.etag import entity_etag, etag_matches, list_etag, not_modified, set_etag
+from core.export import export_response
+from core.importer import parse_records
+from core.security import jwt_bearer
+from core.serialization import json_response
 from core.services.character_service import CharacterService
-from core.models.user import User
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response
+from config import settings
 from container import Container
-from core.schema.base_schema import Blank
-from core.schema.character_schema import PostCharacter, UpdateCharacter, Character
+from db.database import AsyncDatabase
+from core.schema.auth_schema import Principal
+from core.schema.base_schema import Blank, BulkResult, ImportResult, Page
+from core.schema.character_schema import (
+    BulkUpdateCharacter, CharacterFilter, PostCharacter, UpdateCharacter, Character
+)
 
 router = APIRouter(
     prefix="/characters",
     tags=["characters"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 
 
 
-@router.get("", response_model=List[Character], dependencies=[Depends(get_current_user)])
+@router.get("", response_model=Page[Character], dependencies=[Depends(get_current_user)])
 @inject
 async def get_characters(
+        limit: int = Query(settings.page_size, ge=1, le=settings.max_page_size),
+        cursor: Optional[str] = None,
+        filters: CharacterFilter = Depends(),
+        if_none_match: Optional[str] = Header(None),
         service: CharacterService = Depends(Provide[Container.character_service])
 ):
-    characters = service.get_list()
-    return characters
+    etag = list_etag(await service.get_list_generation(), limit, cursor, filters.model_dump_json())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return json_response(await service.get_list_json(limit, cursor, filters), etag)
+
+
+@router.get("/export", dependencies=[Depends(get_current_user)])
+@inject
+async def export_characters(
+        format: Literal["ndjson", "csv"] = "ndjson",
+        service: CharacterService = Depends(Provide[Container.character_service])
+):
+    fields = list(Character.model_fields)
+    return export_response(service.stream(fields, settings.export_batch_size), fields, format, "characters")
+
+
+@router.get("/search", response_model=List[Character], dependencies=[Depends(get_current_user)])
+@inject
+async def search_characters(
+        q: str = Query(..., min_length=3, max_length=100),
+        limit: int = Query(10, ge=1, le=settings.search_max_results),
+        service: CharacterService = Depends(Provide[Container.character_service])
+):
+    return json_response(await service.search_json(q, limit))
+
+
+@router.post("/import", response_model=ImportResult)
+@inject
+async def import_characters(
+        request: Request,
+        format: Literal["ndjson", "csv"] = "ndjson",
+        service: CharacterService = Depends(Provide[Container.character_service]),
+        db: AsyncDatabase = Depends(Provide[Container.db]),
+        current_user: Principal = Depends(get_current_user)
+):
+    """Each chunk commits on its own: no connection or transaction is held while the client
+    uploads, and a late error or disconnect keeps the chunks already inserted."""
+    records = parse_records(request.stream(), format)
+    async with db.autonomous():
+        return await service.import_records(
+            records, current_user.id, settings.import_batch_size, settings.import_max_rejects
+        )
+
+
+@router.post("/bulk", response_model=BulkResult)
+@inject
+async def create_characters(
+        payload: List[PostCharacter] = Body(..., max_length=settings.bulk_max_items),
+        service: CharacterService = Depends(Provide[Container.character_service]),
+        current_user: Principal = Depends(get_current_user)
+):
+    for character in payload:
+        character.user_id = current_user.id
+    return await service.add_many(payload)
+
+
+@router.patch("/bulk", response_model=BulkResult, dependencies=[Depends(get_current_user)])
+@inject
+async def update_characters(
+        payload: List[BulkUpdateCharacter] = Body(..., max_length=settings.bulk_max_items),
+        service: CharacterService = Depends(Provide[Container.character_service])
+):
+    return await service.patch_many(payload)
+
+
+@router.delete("/bulk", response_model=BulkResult, dependencies=[Depends(get_current_user)])
+@inject
+async def delete_characters(
+        ids: List[int] = Body(..., max_length=settings.bulk_max_items),
+        service: CharacterService = Depends(Provide[Container.character_service])
+):
+    return await service.remove_many(ids)
 
 
 @router.get("/{id}", response_model=Character, dependencies=[Depends(get_current_user)])
 @inject
 async def get_character(
         id: int,
-        service: CharacterService = Depends(Provide[Container.character_service])
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        service: CharacterService = Depends(Provide[Container.character_service]),
 ):
-    return service.get_by_field("id", id)
+    # revalidation only needs updated_at, the full row is loaded when it changed
+    if if_none_match:
+        etag = entity_etag(id, await service.get_version(id))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    character = await service.get_by_field("id", id)
+    set_etag(response, entity_etag(character.id, character.updated_at))
+    return character
 
 
 @router.post("", response_model=Character)
@@ -41,10 +132,10 @@ async def get_character(
 async def create_character(
         payload: PostCharacter,
         service: CharacterService = Depends(Provide[Container.character_service]),
-        current_user: User = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
 ):
     payload.user_id = current_user.id
-    return service.add(payload)
+    return await service.add(payload)
 
 
 @router.patch("/{id}", response_model=Character, dependencies=[Depends(get_current_user)])
@@ -54,7 +145,7 @@ async def update_character(
         payload: UpdateCharacter,
         service: CharacterService = Depends(Provide[Container.character_service])
 ):
-    return service.patch(id, payload)
+    return await service.patch(id, payload)
 
 
 @router.delete("/{id}", response_model=Blank, dependencies=[Depends(get_current_user)])
@@ -63,4 +154,5 @@ async def delete_character(
         id: int,
         service: CharacterService = Depends(Provide[Container.character_service])
 ):
-    return service.remove_by_id(id)
+    await service.remove_by_id(id)
+    return Blank()
@@ -0,0 +1,38 @@
+from core.cache import LRUCache
+from core.dependencies import internal_access
+from core.metrics import Metrics
+from core.security import verified_tokens
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from config import settings
+from container import Container
+from db.database import AsyncDatabase
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(internal_access)]
+)
+
+
+@router.get("/db/pool")
+@inject
+async def db_pool_stats(db: AsyncDatabase = Depends(Provide[Container.db])):
+    return db.pool_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+@inject
+async def metrics(
+        metrics: Metrics = Depends(Provide[Container.metrics]),
+        db: AsyncDatabase = Depends(Provide[Container.db]),
+        principal_cache: LRUCache = Depends(Provide[Container.principal_cache]),
+):
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    text = metrics.render(pool=db.pool_stats(), caches={
+        "principal": principal_cache, "verified_tokens": verified_tokens.cache,
+    })
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
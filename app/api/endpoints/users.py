@@ -1,50 +1,77 @@
-from typing import List
+from typing import Literal, Optional
 
 from core.dependencies import get_current_user
-from core.security import JWTBearer
+from core.etag import entity_etag, etag_matches, list_etag, not_modified, set_etag
+from core.export import export_response
+from core.security import jwt_bearer
+from core.serialization import json_response
 from core.services.user_service import UserService
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from config import settings
 from container import Container
-from core.schema.base_schema import Blank
-from core.schema.character_schema import UpdateCharacter
-from core.schema.user_schema import User
+from core.schema.base_schema import Blank, Page
+from core.schema.user_schema import UpdateUser, User
 
 
 router = APIRouter(
     prefix="/users",
     tags=["users"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 
 
 
-@router.get("", response_model=List[User], dependencies=[Depends(get_current_user)])
+@router.get("", response_model=Page[User], dependencies=[Depends(get_current_user)])
 @inject
 async def get_users(
+        limit: int = Query(settings.page_size, ge=1, le=settings.max_page_size),
+        cursor: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None),
         service: UserService = Depends(Provide[Container.user_service])
 ):
-    users = service.get_list()
-    return users
+    etag = list_etag(await service.get_list_version(), limit, cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return json_response(await service.get_list_json(limit, cursor), etag)
+
+
+@router.get("/export", dependencies=[Depends(get_current_user)])
+@inject
+async def export_users(
+        format: Literal["ndjson", "csv"] = "ndjson",
+        service: UserService = Depends(Provide[Container.user_service])
+):
+    fields = list(User.model_fields)
+    return export_response(service.stream(fields, settings.export_batch_size), fields, format, "users")
 
 
 @router.get("/{id}", response_model=User, dependencies=[Depends(get_current_user)])
 @inject
 async def get_user(
         id: int,
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
         service: UserService = Depends(Provide[Container.user_service]),
 ):
-    return service.get_by_id(id)
+    # revalidation only needs updated_at, the full row is loaded when it changed
+    if if_none_match:
+        etag = entity_etag(id, await service.get_version(id))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    user = await service.get_by_field("id", id)
+    set_etag(response, entity_etag(user.id, user.updated_at))
+    return user
 
 
 @router.patch("/{id}", response_model=User, dependencies=[Depends(get_current_user)])
 @inject
 async def update_user(
         id: int,
-        user: UpdateCharacter,
+        user: UpdateUser,
         service: UserService = Depends(Provide[Container.user_service])
 ):
-    return service.patch(id, user)
+    return await service.patch(id, user)
 
 
 @router.delete("/{id}", response_model=Blank, dependencies=[Depends(get_current_user)])
@@ -53,4 +80,5 @@ async def delete_user(
         id: int,
         service: UserService = Depends(Provide[Container.user_service])
 ):
-    return service.remove_by_id(id)
+    await service.remove_by_id(id)
+    return Blank()
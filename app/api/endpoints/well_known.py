@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from config import settings
+from core.security import key_ring
+
+router = APIRouter(
+    prefix="/.well-known",
+    tags=["well-known"],
+)
+
+
+@router.get("/jwks.json")
+async def jwks():
+    # verifiers may cache the keys this long; a new key is published at least as long before it signs
+    return JSONResponse(key_ring.jwks(), headers={"Cache-Control": f"public, max-age={settings.jwks_max_age}"})
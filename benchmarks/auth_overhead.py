@@ -0,0 +1,74 @@
+"""Per-request auth overhead of a protected endpoint, before and after single-pass verification.
+
+Before: the router-level ``JWTBearer()`` and the one inside ``get_current_user`` each decoded
+the token with PyJWT, then ``get_current_user`` decoded it again with python-jose.
+After: ``jwt_bearer`` decodes once and every dependency reads ``request.state.token_payload``;
+``verified_tokens`` is cleared every round so each request pays that one decode.
+Cached: the same, with the token already in ``verified_tokens``, as for a repeat token.
+
+Both sides verify the same legacy HS256 token, the signature scheme these paths were measured
+with. Run with ``python -m benchmarks.auth_overhead``.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import jwt
+from jose import jwt as jose_jwt
+from starlette.requests import Request
+
+from config import settings
+from core.schema.auth_schema import Payload
+from core.security import LEGACY_ALGORITHM, JWTBearer, decode_jwt, verified_tokens
+
+ROUNDS = 20_000
+
+
+def make_request(token: str) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def before(token: str) -> Payload:
+    for _ in range(2):
+        decode_jwt(token)
+    return Payload(**jose_jwt.decode(token, settings.secret_key, algorithms=LEGACY_ALGORITHM))
+
+
+async def after(token: str, bearer: JWTBearer, cached: bool = False) -> Payload:
+    if not cached:
+        verified_tokens.cache.clear()
+    request = make_request(token)
+    await bearer(request)
+    return await bearer(request)
+
+
+async def main() -> None:
+    claims = {"id": 1, "email": "bench@example.com", "first_name": "Bench"}
+    token = jwt.encode({**claims, "exp": datetime.now() + timedelta(hours=1)}, settings.secret_key,
+                       algorithm=LEGACY_ALGORITHM)
+    bearer = JWTBearer()
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        before(token)
+    before_us = (time.perf_counter() - start) / ROUNDS * 1e6
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await after(token, bearer)
+    after_us = (time.perf_counter() - start) / ROUNDS * 1e6
+
+    await after(token, bearer)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await after(token, bearer, cached=True)
+    cached_us = (time.perf_counter() - start) / ROUNDS * 1e6
+
+    print(f"before: {before_us:.1f} us/request")
+    print(f"after:  {after_us:.1f} us/request ({before_us / after_us:.1f}x)")
+    print(f"cached: {cached_us:.1f} us/request ({before_us / cached_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
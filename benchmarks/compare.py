@@ -0,0 +1,40 @@
+"""Compare two ``benchmarks.run`` result files and flag regressions.
+
+Usage: ``python -m benchmarks.compare base.json head.json [--threshold 0.1]``. Exits with status
+1 when any scenario's p95 latency grows, or its throughput drops, by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative change")
+    args = parser.parse_args()
+
+    with open(args.base) as base_file, open(args.head) as head_file:
+        base, head = json.load(base_file), json.load(head_file)
+
+    print(f"{base['meta']['commit']} -> {head['meta']['commit']}")
+    print(f"{'scenario':<18}{'p95 base':>10}{'p95 head':>10}{'change':>9}{'rps base':>10}{'rps head':>10}{'change':>9}")
+    regressions = []
+    for name, head_stats in head["scenarios"].items():
+        base_stats = base["scenarios"].get(name)
+        if not base_stats:
+            continue
+        p95_change = head_stats["p95_ms"] / base_stats["p95_ms"] - 1
+        rps_change = head_stats["throughput_rps"] / base_stats["throughput_rps"] - 1
+        flag = ""
+        if p95_change > args.threshold or rps_change < -args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<18}{base_stats['p95_ms']:>10.1f}{head_stats['p95_ms']:>10.1f}{p95_change:>+9.1%}"
+              f"{base_stats['throughput_rps']:>10.1f}{head_stats['throughput_rps']:>10.1f}{rps_change:>+9.1%}{flag}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Local stand-in for the Google and GitHub OAuth endpoints used by the callbacks.
+
+Serves token exchange, JWKS and user-info endpoints so the OAuth callbacks can be load-tested
+offline. Every authorization ``code`` maps to its own user, so repeated codes log the same
+user in and new codes sign new users up.
+
+Run with ``uvicorn benchmarks.fake_provider:app --port 9000`` and point the ``GOOGLE_*`` and
+``GITHUB_*`` URLs at it (see ``benchmarks/run.py``).
+"""
+import json
+import os
+import time
+from urllib.parse import parse_qs
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+from jwt import algorithms
+
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "bench-google-client")
+KID = "bench-key"
+
+private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+public_jwk = {**json.loads(algorithms.RSAAlgorithm.to_jwk(private_key.public_key())), "kid": KID, "use": "sig"}
+
+app = FastAPI(title="Fake OAuth provider")
+
+
+@app.post("/google/token")
+async def google_token(request: Request):
+    code = await _form_code(request)
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": GOOGLE_CLIENT_ID,
+        "sub": code,
+        "email": f"google-{code}@bench.test",
+        "email_verified": True,
+        "given_name": "Google",
+        "family_name": code,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    id_token = jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": KID})
+    return {"id_token": id_token, "access_token": f"google-access-{code}", "token_type": "Bearer"}
+
+
+@app.get("/google/certs")
+async def google_certs():
+    return JSONResponse({"keys": [public_jwk]}, headers={"Cache-Control": "public, max-age=3600"})
+
+
+@app.post("/github/token")
+async def github_token(request: Request):
+    code = await _form_code(request)
+    return {"access_token": f"github-access-{code}", "token_type": "bearer", "scope": "user:email"}
+
+
+@app.get("/github/user")
+async def github_user(authorization: str = Header("")):
+    return {"login": _github_login(authorization), "name": "GitHub Bench", "email": None}
+
+
+@app.get("/github/user/emails")
+async def github_emails(authorization: str = Header("")):
+    email = f"{_github_login(authorization)}@bench.test"
+    return [{"email": email, "primary": True, "verified": True}]
+
+
+async def _form_code(request: Request) -> str:
+    # token requests are form encoded; parsed by hand to avoid requiring python-multipart
+    return parse_qs((await request.body()).decode())["code"][0]
+
+
+def _github_login(authorization: str) -> str:
+    return "github-" + authorization.rsplit("-", 1)[-1]
@@ -0,0 +1,93 @@
+"""Serialization cost of a 10k-row ``GET /characters`` page, default path vs fast path.
+
+Default: ORM instances validated against ``Page[Character]`` by FastAPI's
+``serialize_response`` (``from_attributes``) and encoded by ``JSONResponse``.
+TypeAdapter: the same ORM instances through a ``TypeAdapter(Page[Character])`` built once.
+Fast: Core rows from ``read_rows`` dumped with orjson by ``dump_page``.
+
+Each path is timed end to end (query included) and for serialization alone, against a
+temporary SQLite database. Run with ``python -m benchmarks.serialization``.
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+import core.models  # noqa: F401  registers the tables
+from core.models.character import Character as CharacterModel
+from core.repository.character_repository import CharacterRepository
+from core.schema.base_schema import Page
+from core.schema.character_schema import CHARACTER_FIELDS, Character
+from core.serialization import dump_page
+from db.database import AsyncDatabase
+
+ROWS = 10_000
+ROUNDS = 10
+
+page_adapter = TypeAdapter(Page[Character])
+response_field = create_model_field(name="Response_get_characters", type_=Page[Character], mode="serialization")
+
+
+async def default_serialization(page) -> bytes:
+    content = await serialize_response(field=response_field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def adapter_serialization(page) -> bytes:
+    return page_adapter.dump_json(page_adapter.validate_python(page))
+
+
+async def fast_serialization(page) -> bytes:
+    return dump_page(page["items"], page["next_cursor"])
+
+
+async def timed(function, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await function(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AsyncDatabase(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await db.create_database()
+        repository = CharacterRepository(session_factory=db.session)
+        async with db.session() as session:
+            await session.execute(CharacterModel.__table__.insert(), [
+                {"name": f"Clone {i}", "height": 183.0, "mass": 79.5, "hair_color": "black",
+                 "skin_color": "tan", "eye_color": "brown"}
+                for i in range(ROWS)
+            ])
+
+        orm_page = await repository.read(ROWS)
+        row_page = await repository.read_rows(CHARACTER_FIELDS, ROWS)
+        assert await default_serialization(orm_page) == await fast_serialization(row_page)
+
+        async def default_path():
+            await default_serialization(await repository.read(ROWS))
+
+        async def adapter_path():
+            await adapter_serialization(await repository.read(ROWS))
+
+        async def fast_path():
+            await fast_serialization(await repository.read_rows(CHARACTER_FIELDS, ROWS))
+
+        print(f"{ROWS} rows, mean of {ROUNDS} rounds")
+        print(f"{'path':<14}{'query + serialize ms':>22}{'serialize ms':>14}")
+        for name, path, serialize, page in (
+            ("default", default_path, default_serialization, orm_page),
+            ("TypeAdapter", adapter_path, adapter_serialization, orm_page),
+            ("fast", fast_path, fast_serialization, row_page),
+        ):
+            print(f"{name:<14}{await timed(path):>22.1f}{await timed(serialize, page):>14.1f}")
+        await db.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
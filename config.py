@@ -23,16 +23,90 @@ class BaseConfig(BaseSettings):
     secret_key: str = os.getenv("SECRET_KEY")
     access_token_expire: int = 60 * 24 * 30  # 60 minutes * 24 hours * 30 days = 30 days
 
+    # TOKEN SIGNING KEYS (shared by every replica: the signing_keys table, or a mounted directory)
+    jwt_algorithm: str = os.getenv("JWT_ALGORITHM", "RS256")  # "RS256" or "EdDSA"
+    jwt_key_store: str = os.getenv("JWT_KEY_STORE", "database")  # "database" or "directory"
+    jwt_keys_dir: str = os.getenv("JWT_KEYS_DIR", "/run/secrets/jwt_keys")
+    jwt_key_reload_interval: int = int(os.getenv("JWT_KEY_RELOAD_INTERVAL", 60))  # below JWKS_MAX_AGE
+    jwt_key_rotation_interval: int = int(os.getenv("JWT_KEY_ROTATION_INTERVAL", 60 * 60 * 24 * 7))  # seconds
+    jwks_max_age: int = int(os.getenv("JWKS_MAX_AGE", 300))  # a new key is published this long before it signs
+    jwt_accept_legacy_tokens: bool = os.getenv("JWT_ACCEPT_LEGACY_TOKENS", "true").lower() == "true"  # HS256
+
+    # VERIFIED TOKEN CACHE (claims of tokens whose signature checked out, kept until their exp)
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", 100_000))
+    introspect_max_tokens: int = int(os.getenv("INTROSPECT_MAX_TOKENS", 1000))
+
+    # SIGN-IN / SIGN-UP RATE LIMITS (attempts per minute and burst; a rate of 0 disables the limit)
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" (per worker) or "redis" (shared)
+    rate_limit_url: str = os.getenv("RATE_LIMIT_URL", os.getenv("CACHE_URL", "redis://localhost:6379/0"))
+    rate_limit_size: int = int(os.getenv("RATE_LIMIT_SIZE", 100_000))  # buckets kept by the memory backend
+    auth_ip_rate: int = int(os.getenv("AUTH_IP_RATE", 30))
+    auth_ip_burst: int = int(os.getenv("AUTH_IP_BURST", 30))
+    auth_email_rate: int = int(os.getenv("AUTH_EMAIL_RATE", 5))
+    auth_email_burst: int = int(os.getenv("AUTH_EMAIL_BURST", 10))
+
+    # PRINCIPAL CACHE
+    principal_cache_size: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10_000))
+    principal_cache_ttl: int = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))  # max staleness in seconds
+
+    # TOKEN VERSIONS (max delay before a user change made by another worker is seen)
+    token_version_sync_interval: float = float(os.getenv("TOKEN_VERSION_SYNC_INTERVAL", 5))
+
+    # PASSWORD HASHING
+    hashing_executor: str = os.getenv("HASHING_EXECUTOR", "process")  # "process" or "thread"
+    hashing_max_workers: int = int(os.getenv("HASHING_MAX_WORKERS", os.cpu_count() or 1))
+    hashing_queue_size: int = int(os.getenv("HASHING_QUEUE_SIZE", 32))
+
+    # CHARACTER READ CACHE
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")  # "memory" (per worker) or "redis" (shared)
+    cache_url: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    cache_size: int = int(os.getenv("CACHE_SIZE", 10_000))
+    cache_ttl: int = int(os.getenv("CACHE_TTL", 300))
+
+    # PAGINATION
+    page_size: int = 50
+    max_page_size: int = 500
+
+    # SEARCH
+    search_max_results: int = int(os.getenv("SEARCH_MAX_RESULTS", 20))
+
+    # EXPORT
+    export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # BULK OPERATIONS
+    bulk_max_items: int = int(os.getenv("BULK_MAX_ITEMS", 10_000))
+    import_batch_size: int = int(os.getenv("IMPORT_BATCH_SIZE", 5000))
+    import_max_rejects: int = int(os.getenv("IMPORT_MAX_REJECTS", 1000))  # rejects listed in the response
+
     backend_cors_origins: List[str] = ["*"]
 
     # DATABASE
     engine: str = os.getenv("ENGINE")
+    async_engine: str = os.getenv("ASYNC_ENGINE", "postgresql+asyncpg")
     user: str = os.getenv("POSTGRES_USER")
     password: str = os.getenv("POSTGRES_PASSWORD")
     database_name: str = os.getenv("POSTGRES_DB")
     host: str = os.getenv("POSTGRES_HOST")
     port: str = os.getenv("POSTGRES_PORT")
     database_url: str = f"{engine}://{user}:{password}@{host}:{port}/{database_name}"
+    async_database_url: str = f"{async_engine}://{user}:{password}@{host}:{port}/{database_name}"
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    db_echo: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # OAUTH HTTP CLIENT
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+    http2: bool = os.getenv("HTTP2", "true").lower() == "true"
+    http_max_retries: int = int(os.getenv("HTTP_MAX_RETRIES", 2))
+    http_backoff_base: float = float(os.getenv("HTTP_BACKOFF_BASE", 0.1))
+    http_backoff_max: float = float(os.getenv("HTTP_BACKOFF_MAX", 1))
+    http_breaker_failure_threshold: int = int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", 5))
+    http_breaker_reset_timeout: float = float(os.getenv("HTTP_BREAKER_RESET_TIMEOUT", 30))
 
     # GOOGLE OAUTH
     google_client_id: str = os.getenv("GOOGLE_CLIENT_ID")
@@ -41,6 +115,10 @@ class BaseConfig(BaseSettings):
     google_auth_url: str = os.getenv("GOOGLE_AUTH_URL")
     google_token_url: str = os.getenv("GOOGLE_TOKEN_URL")
     google_jwks_url: str = os.getenv("GOOGLE_JWKS_URL")
+    google_connect_timeout: float = float(os.getenv("GOOGLE_CONNECT_TIMEOUT", 2))
+    google_read_timeout: float = float(os.getenv("GOOGLE_READ_TIMEOUT", 5))
+    google_jwks_default_ttl: int = int(os.getenv("GOOGLE_JWKS_DEFAULT_TTL", 300))
+    google_jwks_min_refresh_interval: int = int(os.getenv("GOOGLE_JWKS_MIN_REFRESH_INTERVAL", 30))
 
     # GITHUB OAUTH
     github_client_id: str = os.getenv("GITHUB_CLIENT_ID")
@@ -49,10 +127,20 @@ class BaseConfig(BaseSettings):
     github_auth_url: str = os.getenv("GITHUB_AUTH_URL")
     github_token_url: str = os.getenv("GITHUB_TOKEN_URL")
     github_user_info_url: str = os.getenv("GITHUB_USER_INFO_URL")
+    github_connect_timeout: float = float(os.getenv("GITHUB_CONNECT_TIMEOUT", 2))
+    github_read_timeout: float = float(os.getenv("GITHUB_READ_TIMEOUT", 5))
+    github_lookup_budget: float = float(os.getenv("GITHUB_LOOKUP_BUDGET", 5))
+    github_profile_cache_ttl: int = int(os.getenv("GITHUB_PROFILE_CACHE_TTL", 60))
 
     # FRONTEND
     frontend_url: str = os.getenv("FRONTEND_URL")
 
+    # METRICS (request latency and SQL accounting, scraped from /internal/metrics)
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # INTERNAL ENDPOINTS (disabled unless a key is set)
+    internal_api_key: str = os.getenv("INTERNAL_API_KEY", "")
+
     model_config = SettingsConfigDict(env_prefix='my_prefix_')
 
 
@@ -61,6 +149,7 @@ class TestConfig(BaseConfig):
     env: str = "test"
     sqlite_file_name: str = "character.db"
     database_url: str = f"sqlite:///{sqlite_file_name}"
+    async_database_url: str = f"sqlite+aiosqlite:///{sqlite_file_name}"
 
 
 def get_settings() -> BaseConfig:
@@ -1,14 +1,21 @@
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits
 
 from config import settings
+from core.cache import LRUCache, MemoryCacheBackend, ReadThroughCache, RedisCacheBackend
+from core.http import ProviderClient
+from core.jwks import JWKSCache
+from core.keys import DatabaseKeyStore, DirectoryKeyStore
+from core.metrics import Metrics
+from core.rate_limit import Limit, MemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend
 from core.repository.user_repository import UserRepository
+from core.token_versions import TokenVersions
 from core.services.auth_service import AuthService
 from core.services.character_service import CharacterService
 from core.services.oauth_service import GoogleOAuthService, GitHubOAuthService
 from core.services.user_service import UserService
 from core.repository.character_repository import CharacterRepository
 from dependency_injector import containers, providers
-from db.database import Database
+from db.database import AsyncDatabase, Database
 
 
 class Container(containers.DeclarativeContainer):
@@ -19,19 +26,126 @@ class Container(containers.DeclarativeContainer):
             "app.api.endpoints.auth",
             "app.api.endpoints.users",
             "app.api.endpoints.characters",
+            "app.api.endpoints.internal",
             "core.dependencies"
         ]
     )
-    db = providers.Singleton(Database, db_url=config.database_url)
+    db = providers.Singleton(
+        AsyncDatabase,
+        db_url=config.async_database_url,
+        echo=config.db_echo,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+    )
+    sync_db = providers.Singleton(Database, db_url=config.database_url, echo=config.db_echo)
+    metrics = providers.Singleton(Metrics)
 
-    user_repository = providers.Factory(UserRepository, session_factory=db.provided.session)
+    key_store = providers.Selector(
+        config.jwt_key_store,
+        database=providers.Singleton(DatabaseKeyStore, session_factory=db.provided.session, passphrase=config.secret_key),
+        directory=providers.Singleton(DirectoryKeyStore, path=config.jwt_keys_dir),
+    )
+    cache_backend = providers.Selector(
+        config.cache_backend,
+        memory=providers.Singleton(MemoryCacheBackend, maxsize=config.cache_size, ttl=config.cache_ttl),
+        redis=providers.Singleton(RedisCacheBackend.from_url, url=config.cache_url),
+    )
+    user_repository = providers.Factory(
+        UserRepository,
+        session_factory=db.provided.session,
+        token_lifetime=config.access_token_expire,
+    )
     character_repository = providers.Factory(CharacterRepository, session_factory=db.provided.session)
 
     auth_service = providers.Factory(AuthService, user_repository=user_repository)
-    user_service = providers.Factory(UserService, user_repository=user_repository)
-    character_service = providers.Factory(CharacterService, character_repository=character_repository)
+    rate_limit_backend = providers.Selector(
+        config.rate_limit_backend,
+        memory=providers.Singleton(MemoryRateLimitBackend, maxsize=config.rate_limit_size),
+        redis=providers.Singleton(RedisRateLimitBackend.from_url, url=config.rate_limit_url),
+    )
+    auth_rate_limiter = providers.Singleton(
+        RateLimiter,
+        backend=rate_limit_backend,
+        namespace="auth",
+        limits=providers.Dict(
+            ip=providers.Factory(Limit, rate=config.auth_ip_rate, burst=config.auth_ip_burst),
+            email=providers.Factory(Limit, rate=config.auth_email_rate, burst=config.auth_email_burst),
+        ),
+    )
+    principal_cache = providers.Singleton(
+        LRUCache, maxsize=config.principal_cache_size, ttl=config.principal_cache_ttl
+    )
+
+    token_versions = providers.Singleton(
+        TokenVersions,
+        sync_interval=config.token_version_sync_interval,
+        token_lifetime=config.access_token_expire,
+    )
+
+    user_service = providers.Factory(
+        UserService,
+        user_repository=user_repository,
+        principal_cache=principal_cache,
+        token_versions=token_versions,
+    )
+    character_cache = providers.Singleton(
+        ReadThroughCache,
+        backend=cache_backend,
+        namespace="characters",
+        ttl=config.cache_ttl,
+        on_commit=db.provided.on_commit,
+    )
+    character_service = providers.Factory(
+        CharacterService, character_repository=character_repository, cache=character_cache
+    )
+
+    http_client = providers.Singleton(
+        AsyncClient,
+        limits=providers.Factory(
+            Limits,
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive_connections,
+            keepalive_expiry=config.http_keepalive_expiry,
+        ),
+        http2=config.http2,
+    )
+
+    google_http_client = providers.Singleton(
+        ProviderClient,
+        name="google",
+        client=http_client,
+        connect_timeout=config.google_connect_timeout,
+        read_timeout=config.google_read_timeout,
+        max_retries=config.http_max_retries,
+        backoff_base=config.http_backoff_base,
+        backoff_max=config.http_backoff_max,
+        failure_threshold=config.http_breaker_failure_threshold,
+        reset_timeout=config.http_breaker_reset_timeout,
+    )
 
-    http_client = providers.Singleton(AsyncClient)
+    github_http_client = providers.Singleton(
+        ProviderClient,
+        name="github",
+        client=http_client,
+        connect_timeout=config.github_connect_timeout,
+        read_timeout=config.github_read_timeout,
+        max_retries=config.http_max_retries,
+        backoff_base=config.http_backoff_base,
+        backoff_max=config.http_backoff_max,
+        failure_threshold=config.http_breaker_failure_threshold,
+        reset_timeout=config.http_breaker_reset_timeout,
+    )
+
+    google_jwks_cache = providers.Singleton(
+        JWKSCache,
+        jwks_url=config.google_jwks_url,
+        http_client=google_http_client,
+        default_ttl=config.google_jwks_default_ttl,
+        min_refresh_interval=config.google_jwks_min_refresh_interval,
+    )
 
     google_oauth_service = providers.Factory(
         GoogleOAuthService,
@@ -40,12 +154,14 @@ class Container(containers.DeclarativeContainer):
         redirect_uri=config.google_redirect_uri,
         auth_url=config.google_auth_url,
         token_url=config.google_token_url,
-        jwks_url=config.google_jwks_url,
+        jwks_cache=google_jwks_cache,
         access_token_expire=config.access_token_expire,
         user_repository=user_repository,
-        http_client=http_client,
+        http_client=google_http_client,
     )
 
+    github_profile_cache = providers.Singleton(LRUCache, maxsize=1000, ttl=config.github_profile_cache_ttl)
+
     github_oauth_service = providers.Factory(
         GitHubOAuthService,
         client_id=config.github_client_id,
@@ -55,6 +171,8 @@ class Container(containers.DeclarativeContainer):
         token_url=config.github_token_url,
         access_token_expire=config.access_token_expire,
         user_repository=user_repository,
-        http_client=http_client,
-        user_info_url=config.github_user_info_url
+        http_client=github_http_client,
+        user_info_url=config.github_user_info_url,
+        profile_cache=github_profile_cache,
+        lookup_budget=config.github_lookup_budget,
     )
\ No newline at end of file
@@ -0,0 +1,193 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from pydantic import TypeAdapter
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with per-entry expiry and hit/miss counters.
+
+    Not thread safe; meant to be used from the event loop of a single worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend:
+    """Per-process backend; entries are not shared between workers."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache = LRUCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, float("inf") if ttl is None else ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+
+class RedisCacheBackend:
+    """Shared backend for multi-worker deployments, on any Redis-compatible server."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package") from e
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.client.set(key, value, px=None if ttl is None else int(ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+
+class Generation:
+    """Opaque token replaced after every commit that changes a collection.
+
+    Kept in a cache backend so, with a shared backend, every worker sees the same token. It
+    expires after ``ttl`` like the entries it versions, so with the per-worker memory backend a
+    worker that missed another worker's write stops reusing its token within ``ttl``.
+    """
+
+    def __init__(self, backend, key: str, ttl: float,
+                 on_commit: Callable[[Callable[[], Awaitable[None]]], Awaitable[None]]) -> None:
+        self.backend = backend
+        self.key = key
+        self.ttl = ttl
+        self.on_commit = on_commit
+
+    async def current(self) -> str:
+        generation = await self.backend.get(self.key)
+        if generation is None:
+            generation = uuid.uuid4().hex.encode()
+            await self.backend.set(self.key, generation, self.ttl)
+        return generation.decode()
+
+    async def bump(self) -> None:
+        """Replace the token once the current transaction commits."""
+        await self.on_commit(self.replace)
+
+    async def replace(self) -> None:
+        await self.backend.set(self.key, uuid.uuid4().hex.encode(), self.ttl)
+
+
+class ReadThroughCache:
+    """Read-through cache of serialized values, in front of any ``CacheBackend``.
+
+    Entries are stored as JSON (encoded with a pydantic ``TypeAdapter``, or already serialized
+    for lists) so every backend behaves the same. Each entry lives under a generation token, one
+    per key and one shared by all list entries, which ``invalidate`` replaces instead of
+    deleting the entry. Readers take the token before loading, so a value loaded across an
+    invalidation is stored under the old token and never served. Invalidation runs through
+    ``on_commit`` so readers cannot repopulate an entry from a transaction that has not
+    committed yet.
+    """
+
+    def __init__(self, backend, namespace: str, ttl: float,
+                 on_commit: Callable[[Callable[[], Awaitable[None]]], Awaitable[None]]) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.on_commit = on_commit
+        self.generation = Generation(backend, f"{namespace}:generation", ttl, on_commit)
+        self.hits = 0
+        self.misses = 0
+
+    async def peek(self, key: str, adapter: TypeAdapter) -> Any:
+        cached = await self.backend.get(await self._entry_key(key))
+        return None if cached is None else adapter.validate_json(cached)
+
+    async def get(self, key: str, adapter: TypeAdapter, load: Callable[[], Awaitable[Any]]) -> Any:
+        key = await self._entry_key(key)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return adapter.validate_json(cached)
+        self.misses += 1
+        value = adapter.validate_python(await load())
+        await self.backend.set(key, adapter.dump_json(value), self.ttl)
+        return value
+
+    async def get_list_json(self, key: str, load: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return a list entry as the JSON ``load`` serialized, without decoding it on hits."""
+        key = f"{self.namespace}:list:{await self.generation.current()}:{key}"
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        content = await load()
+        await self.backend.set(key, content, self.ttl)
+        return content
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop ``keys`` and every list entry once the current transaction commits."""
+        async def drop() -> None:
+            for key in keys:
+                await self._key_generation(key).replace()
+            await self.generation.replace()
+
+        await self.on_commit(drop)
+
+    def _key_generation(self, key: str) -> Generation:
+        return Generation(self.backend, f"{self.namespace}:{key}:generation", self.ttl, self.on_commit)
+
+    async def _entry_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}:{await self._key_generation(key).current()}"
@@ -1,29 +1,28 @@
-from core.exceptions import AuthError
-from core.security import ALGORITHM, JWTBearer
+import hmac
+
+from core.security import jwt_bearer
 from core.services.user_service import UserService
-from core.models.user import User
 from dependency_injector.wiring import inject, Provide
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException
 from config import settings
 from container import Container
-from core.schema.auth_schema import Payload
-from jose import jwt
-from pydantic import ValidationError
+from core.schema.auth_schema import Payload, Principal
 
 
 @inject
-def get_current_user(
-        token: str = Depends(JWTBearer()),
+async def get_current_user(
+        token_data: Payload = Depends(jwt_bearer),
         service: UserService = Depends(Provide[Container.user_service]),
-) -> User:
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=ALGORITHM)
-        token_data = Payload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise AuthError(message="Could not validate credentials")
-
-    current_user = service.get_by_field("id", token_data.id)
+) -> Principal:
+    current_user = await service.get_principal(token_data)
     if not current_user:
-        raise AuthError(message="Lead not found")
+        raise HTTPException(status_code=401, detail="User not found.")
 
     return current_user
+
+
+async def internal_access(x_internal_key: str = Header(None)) -> None:
+    """Hide internal endpoints unless the request carries ``INTERNAL_API_KEY``."""
+    key = settings.internal_api_key
+    if not key or not hmac.compare_digest(x_internal_key or "", key):
+        raise HTTPException(status_code=404, detail="Not Found")
@@ -0,0 +1,40 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def entity_etag(id: int, updated_at: datetime) -> str:
+    return _etag("entity", id, updated_at.isoformat())
+
+
+def list_etag(version: Any, *params: Any) -> str:
+    """ETag of a collection page; ``version`` changes with every commit that touches the
+    collection and ``params`` are the query parameters that select the page."""
+    return _etag("list", version, *params)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 prescribes for ``If-None-Match``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def _etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, List, Mapping
+
+from fastapi.responses import StreamingResponse
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _ndjson(batches: AsyncIterator[List[Mapping]], fields: List[str]) -> AsyncIterator[str]:
+    async for rows in batches:
+        yield "".join(json.dumps(dict(row), default=_json_default) + "\n" for row in rows)
+
+
+async def _csv(batches: AsyncIterator[List[Mapping]], fields: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    async for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(batches: AsyncIterator[List[Mapping]], fields: List[str],
+                    format: str, filename: str) -> StreamingResponse:
+    """Stream row batches as NDJSON or CSV without holding more than one batch in memory."""
+    content = _csv(batches, fields) if format == "csv" else _ndjson(batches, fields)
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
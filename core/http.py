@@ -0,0 +1,102 @@
+import asyncio
+import random
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient, HTTPError, Response, Timeout, TransportError
+
+from logger_config import logger
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+class ProviderUnavailableError(HTTPError):
+    """Raised without a network call while a provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and lets one trial call through
+    once ``reset_timeout`` seconds have passed (half-open)."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half-open":
+            # one trial call per reset window
+            self.opened_at = time.monotonic()
+        return state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ProviderClient:
+    """Shared ``AsyncClient`` wrapper for one OAuth provider.
+
+    Applies the provider's timeouts, retries idempotent GETs on transport errors and 429/5xx
+    with jittered exponential backoff, and fails fast while the provider's circuit is open.
+    """
+
+    def __init__(self, name: str, client: AsyncClient, connect_timeout: float, read_timeout: float,
+                 max_retries: int, backoff_base: float, backoff_max: float,
+                 failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.client = client
+        self.timeout = Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    async def get(self, url: str, **kwargs) -> Response:
+        return await self._request("GET", url, self.max_retries, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Response:
+        # authorization codes are single use, so POSTs are never retried
+        return await self._request("POST", url, 0, **kwargs)
+
+    async def _request(self, method: str, url: str, retries: int, **kwargs) -> Response:
+        for attempt in range(retries + 1):
+            if not self.breaker.allow():
+                raise ProviderUnavailableError(f"{self.name} is unavailable, circuit open")
+            try:
+                response = await self.client.request(method, url, timeout=self.timeout, **kwargs)
+            except TransportError as e:
+                self.breaker.record_failure()
+                if attempt == retries:
+                    raise
+                logger.warning(f"{self.name} {method} {url} failed ({e!r}), retrying")
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+            await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+
+async def provider_error_handler(request: Request, exc: HTTPError) -> JSONResponse:
+    if isinstance(exc, ProviderUnavailableError):
+        return JSONResponse(status_code=503, content={"detail": str(exc)})
+    return JSONResponse(status_code=502, content={"detail": "Authentication provider error."})
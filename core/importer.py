@@ -0,0 +1,49 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Tuple, Union
+
+Record = Union[dict, str]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Tuple[int, Record]]:
+    """Parse an upload incrementally and yield ``(line_number, record)`` per non-blank line.
+
+    ``record`` is a dict of raw values, or an error message when the line cannot be parsed.
+    CSV uploads need a header line and one record per line; empty CSV values are dropped
+    so schema defaults apply.
+    """
+    header = None
+    line_number = 0
+    async for line in _lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        if format == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = values
+            elif len(values) != len(header):
+                yield line_number, f"expected {len(header)} fields, got {len(values)}"
+            else:
+                yield line_number, {key: value for key, value in zip(header, values) if value != ""}
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, f"invalid JSON: {e}"
+                continue
+            yield line_number, record if isinstance(record, dict) else "expected a JSON object"
@@ -0,0 +1,64 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, Optional
+
+from httpx import HTTPError
+from jwt import algorithms
+
+from core.http import ProviderClient
+from logger_config import logger
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    """In-memory cache of a provider's parsed signing keys.
+
+    Keys live until the ``Cache-Control: max-age`` of the JWKS response runs out. An unknown
+    ``kid`` triggers an early refresh at most once per ``min_refresh_interval`` and concurrent
+    refreshes share a single outbound request. When the provider is unreachable the last known
+    keys keep being served.
+    """
+
+    def __init__(self, jwks_url: str, http_client: ProviderClient,
+                 default_ttl: int = 300, min_refresh_interval: int = 30):
+        self.jwks_url = jwks_url
+        self.http_client = http_client
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch = float("-inf")
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def get_key(self, kid: str) -> Optional[Any]:
+        now = time.monotonic()
+        expired = now >= self._expires_at
+        unknown_kid = kid not in self._keys and now - self._last_fetch >= self.min_refresh_interval
+        if expired or unknown_kid:
+            try:
+                await self._refresh()
+            except (HTTPError, KeyError, ValueError) as e:
+                if not self._keys:
+                    raise
+                # serve the stale keys and retry no sooner than min_refresh_interval
+                self._expires_at = time.monotonic() + self.min_refresh_interval
+                logger.warning(f"JWKS refresh from {self.jwks_url} failed, using cached keys: {e}")
+        return self._keys.get(kid)
+
+    async def _refresh(self) -> None:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._inflight)
+
+    async def _fetch(self) -> None:
+        self._last_fetch = time.monotonic()
+        response = await self.http_client.get(self.jwks_url)
+        response.raise_for_status()
+        self._keys = {key["kid"]: algorithms.RSAAlgorithm.from_jwk(key) for key in response.json()["keys"]}
+        self._expires_at = time.monotonic() + self._max_age(response.headers.get("cache-control"))
+
+    def _max_age(self, cache_control: Optional[str]) -> int:
+        match = MAX_AGE_RE.search(cache_control or "")
+        return int(match.group(1)) if match else self.default_ttl
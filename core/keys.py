@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from fastapi import HTTPException
+from jwt import algorithms
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from core.models.signing_key import SigningKeyRecord
+from logger_config import logger
+
+KEY_SUFFIX = ".pem"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: Any
+    created_at: int
+
+    @property
+    def public_key(self) -> Any:
+        return self.private_key.public_key()
+
+    def to_jwk(self) -> Dict[str, Any]:
+        if self.algorithm == "EdDSA":
+            jwk = json.loads(algorithms.OKPAlgorithm.to_jwk(self.public_key))
+        else:
+            jwk = json.loads(algorithms.RSAAlgorithm.to_jwk(self.public_key))
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+class DatabaseKeyStore:
+    """Keys in the ``signing_keys`` table, shared by every replica that uses the database.
+
+    Private keys are stored as PKCS8 PEM encrypted with ``passphrase`` (``SECRET_KEY``).
+    """
+
+    def __init__(self, session_factory: Callable, passphrase: str) -> None:
+        self.session_factory = session_factory
+        self.passphrase = passphrase.encode()
+
+    async def list(self) -> Dict[str, int]:
+        async with self.session_factory() as session:
+            result = await session.execute(select(SigningKeyRecord.kid, SigningKeyRecord.created_at))
+            return dict(result.tuples().all())
+
+    async def read(self, kid: str) -> Any:
+        async with self.session_factory() as session:
+            pem = await session.scalar(select(SigningKeyRecord.private_key).where(SigningKeyRecord.kid == kid))
+        if pem is None:
+            raise ValueError("deleted while loading")
+        return await asyncio.to_thread(serialization.load_pem_private_key, pem.encode(), self.passphrase)
+
+    async def create(self, kid: str, created_at: int, private_key: Any) -> bool:
+        """Store the key unless another replica already created ``kid``; returns whether it did."""
+        pem = await asyncio.to_thread(
+            private_key.private_bytes, serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+            serialization.BestAvailableEncryption(self.passphrase),
+        )
+        try:
+            async with self.session_factory() as session:
+                session.add(SigningKeyRecord(kid=kid, created_at=created_at, private_key=pem.decode()))
+                await session.flush()
+        except IntegrityError:
+            return False
+        return True
+
+    async def delete(self, kid: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(SigningKeyRecord).where(SigningKeyRecord.kid == kid))
+
+
+class DirectoryKeyStore:
+    """Unencrypted PEM files named ``<kid>.pem``, for keys mounted as a secret or a shared volume.
+
+    When the directory is read-only, rotation is left to whoever provisions it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def list(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self._list)
+
+    async def read(self, kid: str) -> Any:
+        return await asyncio.to_thread(self._read, kid)
+
+    async def create(self, kid: str, created_at: int, private_key: Any) -> bool:
+        return await asyncio.to_thread(self._create, kid, created_at, private_key)
+
+    async def delete(self, kid: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, os.path.join(self.path, kid + KEY_SUFFIX))
+        except FileNotFoundError:
+            pass
+
+    def _list(self) -> Dict[str, int]:
+        if not os.path.isdir(self.path):
+            return {}
+        kids = {}
+        for name in os.listdir(self.path):
+            if name.endswith(KEY_SUFFIX):
+                kids[name[:-len(KEY_SUFFIX)]] = int(os.stat(os.path.join(self.path, name)).st_mtime)
+        return kids
+
+    def _read(self, kid: str) -> Any:
+        with open(os.path.join(self.path, kid + KEY_SUFFIX), "rb") as key_file:
+            return serialization.load_pem_private_key(key_file.read(), password=None)
+
+    def _create(self, kid: str, created_at: int, private_key: Any) -> bool:
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as key_file:
+                key_file.write(pem)
+            os.utime(tmp_path, (created_at, created_at))
+            # link fails if another replica created the kid first, so both end up with its key
+            os.link(tmp_path, os.path.join(self.path, kid + KEY_SUFFIX))
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+        return True
+
+
+class KeyRing:
+    """Asymmetric signing keys loaded from a shared key store.
+
+    The newest key that has been published for at least ``activation_delay`` seconds signs;
+    every stored key verifies. Once the newest key is older than ``rotation_interval`` a new one
+    is generated, so it shows up in the JWKS one cache lifetime before it starts signing, and
+    every replica has reloaded it (``reload_interval`` must be shorter) before any token
+    carries its kid. Keys are named after their rotation slot, so replicas rotating at the same
+    time agree on a single new key. A key is deleted ``retention`` seconds after its successor
+    took over, once every token it signed has expired.
+
+    All store access and key generation happen in ``refresh``, which ``run`` repeats in the
+    background; signing and verification only read memory.
+    """
+
+    def __init__(self, algorithm: str, rotation_interval: int, activation_delay: int,
+                 retention: int, reload_interval: int = 60):
+        if algorithm not in ("RS256", "EdDSA"):
+            raise ValueError(f"Unsupported signing algorithm {algorithm}")
+        self.algorithm = algorithm
+        self.rotation_interval = rotation_interval
+        self.activation_delay = activation_delay
+        self.retention = retention
+        self.reload_interval = reload_interval
+        self.store = None
+        self._keys: Dict[str, SigningKey] = {}
+        self._active: Optional[SigningKey] = None
+
+    def signing_key(self) -> SigningKey:
+        if self._active is None:
+            raise HTTPException(status_code=503, detail="Signing keys are not loaded yet.")
+        return self._active
+
+    def verification_key(self, kid: str) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {"keys": [key.to_jwk() for key in self._keys.values()]}
+
+    async def start(self, store) -> None:
+        """Load the keys from ``store`` (creating the first one if needed) before serving."""
+        self.store = store
+        self._keys, self._active = {}, None
+        await self.refresh()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # keep signing with the keys already loaded and retry on the next interval
+                logger.exception(f"Signing key refresh failed: {e}")
+
+    async def refresh(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        keys = await self._load()
+        newest = max(keys, key=lambda key: key.created_at, default=None)
+        if newest is None or now - newest.created_at >= self.rotation_interval:
+            await self._rotate(now)
+            keys = await self._load()
+        if not keys:
+            raise RuntimeError("The key store holds no signing keys")
+        keys.sort(key=lambda key: key.created_at)
+        published = [key for key in keys if now - key.created_at >= self.activation_delay]
+        # on first start nothing has been published long enough; sign with the newest key
+        active = published[-1] if published else keys[-1]
+        kept = []
+        for key, successor in zip(keys, keys[1:] + [None]):
+            if (successor is not None and key is not active
+                    and now - (successor.created_at + self.activation_delay) >= self.retention):
+                await self.store.delete(key.kid)
+            else:
+                kept.append(key)
+        self._keys = {key.kid: key for key in kept}
+        self._active = active
+
+    async def _rotate(self, now: float) -> None:
+        created_at = int(now)
+        kid = f"{self.algorithm.lower()}-{created_at // self.rotation_interval}"
+        if self.algorithm == "EdDSA":
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            private_key = await asyncio.to_thread(rsa.generate_private_key, public_exponent=65537, key_size=2048)
+        if await self.store.create(kid, created_at, private_key):
+            logger.info(f"Generated {self.algorithm} signing key {kid}")
+
+    async def _load(self) -> List[SigningKey]:
+        keys = []
+        for kid, created_at in (await self.store.list()).items():
+            known = self._keys.get(kid)
+            if known is None:
+                try:
+                    private_key = await self.store.read(kid)
+                except (OSError, ValueError, TypeError) as e:
+                    logger.warning(f"Skipping signing key {kid}: {e}")
+                    continue
+                algorithm = "EdDSA" if isinstance(private_key, ed25519.Ed25519PrivateKey) else "RS256"
+                known = SigningKey(kid, algorithm, private_key, created_at)
+            keys.append(known)
+        return keys
@@ -0,0 +1,208 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.cache import LRUCache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative-on-render histogram; ``observe`` is a bisect and three additions."""
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip([*map(_number, self.buckets), "+Inf"], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{suffix} {_number(self.sum)}"
+        yield f"{name}_count{suffix} {self.count}"
+
+
+class QueryStats:
+    """SQL statements executed, and the time spent in them, by the current request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "queries", "db_seconds", "statuses")
+
+    def __init__(self) -> None:
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+
+
+current_queries: ContextVar[Optional[QueryStats]] = ContextVar("current_queries", default=None)
+
+
+class Metrics:
+    """In-process request and database metrics, rendered in the Prometheus text format.
+
+    Recording only touches plain counters keyed by ``(method, route template)``; labels are
+    formatted when ``/metrics`` is scraped.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, queries: QueryStats) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(seconds)
+        metrics.queries.observe(queries.count)
+        metrics.db_seconds.observe(queries.seconds)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self, pool: Optional[Dict] = None, caches: Optional[Dict[str, LRUCache]] = None) -> str:
+        lines: List[str] = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        routes = sorted(self.routes.items())
+
+        lines += ["# HELP http_requests_total Requests served by route and status.",
+                  "# TYPE http_requests_total counter"]
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+
+        for name, attribute, help_text in (
+            ("http_request_duration_seconds", "latency", "Request latency by route."),
+            ("http_request_db_queries", "queries", "SQL statements executed per request."),
+            ("http_request_db_seconds", "db_seconds", "Time spent executing SQL per request."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), metrics in routes:
+                lines.extend(getattr(metrics, attribute).render(name, _labels(method, route)))
+
+        if pool is not None:
+            lines += _render_pool(pool)
+        if caches:
+            for family, kind, value in (
+                ("cache_hits_total", "counter", lambda cache: cache.hits),
+                ("cache_misses_total", "counter", lambda cache: cache.misses),
+                ("cache_hit_ratio", "gauge", lambda cache: _number(cache.stats()["hit_ratio"])),
+                ("cache_entries", "gauge", len),
+            ):
+                lines.append(f"# TYPE {family} {kind}")
+                lines += [f'{family}{{cache="{name}"}} {value(cache)}' for name, cache in caches.items()]
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request and collecting its SQL statements."""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        queries = QueryStats()
+        token = current_queries.set(queries)
+        self.metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.in_flight -= 1
+            current_queries.reset(token)
+            # the router stores the matched route in the scope, so labels use its template
+            route = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+            self.metrics.observe_request(scope["method"], route, status, elapsed, queries)
+
+
+def track_queries(engine: Engine) -> None:
+    """Count statements and their execution time into the current request's ``QueryStats``.
+
+    For an ``AsyncEngine`` pass its ``sync_engine``.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    queries = current_queries.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += elapsed
+
+
+def _handle_error(context) -> None:
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def _render_pool(pool: Dict) -> List[str]:
+    lines = ["# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+             "# TYPE db_pool_checkout_wait_seconds histogram"]
+    for bound, count in pool["wait_seconds_buckets"].items():
+        lines.append(f'db_pool_checkout_wait_seconds_bucket{{le="{bound}"}} {count}')
+    lines += [
+        f"db_pool_checkout_wait_seconds_sum {_number(pool['wait_seconds_sum'])}",
+        f"db_pool_checkout_wait_seconds_count {pool['checkouts']}",
+        "# TYPE db_pool_checkout_timeouts_total counter",
+        f"db_pool_checkout_timeouts_total {pool['checkout_timeouts']}",
+    ]
+    if "checked_out" in pool:
+        lines += ["# TYPE db_pool_connections gauge"]
+        lines += [f'db_pool_connections{{state="{state}"}} {pool[state]}'
+                  for state in ("checked_in", "checked_out", "overflow")]
+    return lines
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{method}",route="{route}"'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
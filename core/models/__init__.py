@@ -1,2 +1,5 @@
 from .character import Character
 from .user import User
+from .user_revocation import UserRevocation
+from .signing_key import SigningKeyRecord
+from .list_version import ListVersion
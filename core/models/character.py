@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey
+from sqlalchemy import DDL, Column, Integer, Float, String, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 
 from core.models.base_model import Base
@@ -6,6 +6,12 @@ from core.models.base_model import Base
 
 class Character(Base):
     __tablename__ = "characters"
+    # one (column, id) index per filter and sort key of GET /characters, matching its keyset order;
+    # CharacterRepository.filter_clauses rejects combinations none of them serves
+    __table_args__ = tuple(
+        Index(f"ix_characters_{column}_id", column, "id")
+        for column in ("hair_color", "skin_color", "eye_color", "user_id", "height", "mass")
+    )
 
     name = Column(String, unique=True, nullable=False)
     height = Column(Float, nullable=False)
@@ -16,3 +22,30 @@ class Character(Base):
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     user = relationship("User", backref="characters")
+
+
+# name search indexes (see CharacterRepository.search); alembic revision 9f3b1c7e2d54 creates the same
+SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_characters_name_trgm ON characters USING gin (name gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS characters_fts USING fts5("
+        "name, content='characters', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS characters_fts_insert AFTER INSERT ON characters BEGIN "
+        "INSERT INTO characters_fts(rowid, name) VALUES (new.id, new.name); END",
+        "CREATE TRIGGER IF NOT EXISTS characters_fts_delete AFTER DELETE ON characters BEGIN "
+        "INSERT INTO characters_fts(characters_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+        "CREATE TRIGGER IF NOT EXISTS characters_fts_update AFTER UPDATE OF name ON characters BEGIN "
+        "INSERT INTO characters_fts(characters_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+        "INSERT INTO characters_fts(rowid, name) VALUES (new.id, new.name); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Character.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(
+    Character.__table__, "before_drop", DDL("DROP TABLE IF EXISTS characters_fts").execute_if(dialect="sqlite")
+)
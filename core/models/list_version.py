@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from db.database import BaseModel
+
+
+class ListVersion(BaseModel):
+    """Counter of a collection, bumped in the same transaction as every write to it, so every
+    worker reads the same version behind the collection's list ETag."""
+    __tablename__ = "list_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, Text
+
+from db.database import BaseModel
+
+
+class SigningKeyRecord(BaseModel):
+    """Access token signing key, shared by every replica; see ``core.keys.KeyRing``."""
+    __tablename__ = "signing_keys"
+
+    kid = Column(String, primary_key=True)
+    created_at = Column(Integer, nullable=False)  # unix time, compared with the rotation schedule
+    private_key = Column(Text, nullable=False)  # PKCS8 PEM encrypted with SECRET_KEY
@@ -1,14 +1,18 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, Integer, String
 
 from core.models.base_model import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    # polled by TokenVersions.sync for users changed since the last poll
+    __table_args__ = (Index("ix_users_updated_at", "updated_at"),)
 
     email = Column(String, unique=True, nullable=False)
     username = Column(String, unique=True, nullable=False)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     password = Column(String, nullable=True)
+    # bumped on every update; access tokens issued before it was bumped carry outdated claims
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Index, Integer
+
+from core.models.base_model import Base
+
+
+class UserRevocation(Base):
+    """Tombstone of a deleted user; ``TokenVersions.sync`` polls it so every worker, including
+    one started after the delete, rejects the user's tokens. Kept for one token lifetime."""
+    __tablename__ = "user_revocations"
+    __table_args__ = (Index("ix_user_revocations_created_at", "created_at"),)
+
+    user_id = Column(Integer, nullable=False)
@@ -0,0 +1,116 @@
+import hashlib
+import math
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+from fastapi import HTTPException
+
+from core.cache import LRUCache
+
+# (key, emission interval, burst tolerance) in seconds
+Bucket = Tuple[str, float, float]
+
+
+class Limit(NamedTuple):
+    rate: int  # requests per period, 0 disables the limit
+    burst: int
+    period: float = 60
+
+
+class MemoryRateLimitBackend:
+    """Per-process backend; each worker enforces the limits on the share of traffic it serves."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.cache = LRUCache(maxsize, ttl=0)
+
+    async def hit(self, buckets: List[Bucket]) -> float:
+        now = time.monotonic()
+        arrivals = []
+        wait = 0.0
+        for key, interval, tolerance in buckets:
+            arrival = max(self.cache.get(key, now), now)
+            wait = max(wait, arrival - tolerance - now)
+            arrivals.append(arrival + interval)
+        if wait > 0:
+            return wait
+        for (key, _, _), arrival in zip(buckets, arrivals):
+            self.cache.set(key, arrival, ttl=arrival - now)
+        return 0.0
+
+
+# the server clock decides, so workers with skewed clocks share the same buckets
+HIT_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local arrivals = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local interval, tolerance = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+    local arrival = math.max(tonumber(redis.call('GET', key) or 0), now)
+    wait = math.max(wait, arrival - tolerance - now)
+    arrivals[i] = arrival + interval
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, tostring(arrivals[i]), 'PX', math.ceil((arrivals[i] - now) * 1000))
+end
+return '0'
+"""
+
+
+class RedisRateLimitBackend:
+    """Shared backend for multi-worker deployments; every bucket of a request is checked and
+    updated in one atomic script."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+        self.script = client.register_script(HIT_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package") from e
+        return cls(redis.from_url(url))
+
+    async def hit(self, buckets: List[Bucket]) -> float:
+        args = [value for _, interval, tolerance in buckets for value in (interval, tolerance)]
+        return float(await self.script(keys=[key for key, _, _ in buckets], args=args))
+
+
+class RateLimiter:
+    """Token buckets, one per limit and key, kept as GCRA arrival times (one float each).
+
+    ``check(ip=..., email=...)`` spends a token from every named bucket or, when any of them is
+    empty, from none and raises 429 with ``Retry-After``. It is cheap, so it runs before any
+    password hashing.
+    """
+
+    def __init__(self, backend, namespace: str, limits: Dict[str, Limit]) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.limits = {name: limit for name, limit in limits.items() if limit.rate > 0}
+        self.rejected = 0
+
+    async def check(self, **keys: str) -> None:
+        buckets = []
+        for name, value in keys.items():
+            limit = self.limits.get(name)
+            if limit is None or not value:
+                continue
+            interval = limit.period / limit.rate
+            digest = hashlib.blake2b(value.strip().lower().encode(), digest_size=12).hexdigest()
+            buckets.append((f"{self.namespace}:{name}:{digest}", interval, interval * (max(limit.burst, 1) - 1)))
+        if not buckets:
+            return
+        wait = await self.backend.hit(buckets)
+        if wait > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, retry later.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
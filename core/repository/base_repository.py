@@ -1,54 +1,175 @@
-from contextlib import AbstractContextManager
+from contextlib import AbstractAsyncContextManager
 from typing import Callable
 
 from core.exceptions import DuplicatedError, NotFoundError
+from core.pagination import decode_cursor, encode_cursor
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseRepository:
-    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]], model) -> None:
+    def __init__(self, session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]], model) -> None:
         self.session_factory = session_factory
         self.model = model
 
-    def read_by_field(self, field_name, value):
-        with self.session_factory() as session:
-            query = session.query(self.model)
-            query = query.filter(getattr(self.model, field_name) == value).first()
+    async def read_by_field(self, field_name, value):
+        async with self.session_factory() as session:
+            result = await session.execute(select(self.model).where(getattr(self.model, field_name) == value))
+            query = result.scalars().first()
             if not query:
                 raise NotFoundError(message=f"Not found {field_name} : {value}")
             return query
 
-    def read(self):
-        with self.session_factory() as session:
-            query = session.query(self.model)
-            return query
+    async def read_version(self, id: int):
+        """Return the ``updated_at`` of one row without loading the row."""
+        async with self.session_factory() as session:
+            version = await session.scalar(select(self.model.updated_at).where(self.model.id == id))
+            if version is None:
+                raise NotFoundError(message=f"Not found id : {id}")
+            return version
+
+    async def read(self, limit: int, cursor: str = None, where=(), sort: str = "id"):
+        """Return one page ordered by ``sort`` (``-`` prefix for descending) then id, starting
+        after the opaque ``cursor`` and limited to rows matching the ``where`` clauses."""
+        async with self.session_factory() as session:
+            result = await session.execute(self._page_statement(select(self.model), limit, cursor, where, sort))
+            items = result.scalars().all()
+        next_cursor = None
+        if len(items) > limit:
+            next_cursor = self._encode_position(sort, getattr(items[limit - 1], sort.lstrip("-")), items[limit - 1].id)
+        return {"items": items[:limit], "next_cursor": next_cursor}
+
+    async def read_rows(self, fields, limit: int, cursor: str = None, where=(), sort: str = "id"):
+        """Like ``read`` but returns plain dicts of ``fields``, without building ORM instances."""
+        # the sort value and id are selected last for the cursor, even when ``fields`` leaves them out
+        columns = [getattr(self.model, field) for field in fields]
+        columns += [getattr(self.model, sort.lstrip("-")), self.model.id]
+        async with self.session_factory() as session:
+            result = await session.execute(self._page_statement(select(*columns), limit, cursor, where, sort))
+            rows = result.tuples().all()
+        next_cursor = self._encode_position(sort, *rows[limit - 1][-2:]) if len(rows) > limit else None
+        return {"items": [dict(zip(fields, row)) for row in rows[:limit]], "next_cursor": next_cursor}
 
-    def create(self, schema):
-        with self.session_factory() as session:
+    async def stream(self, fields, batch_size: int):
+        """Yield lists of row mappings with ``fields``, in id order, from a server-side cursor."""
+        columns = [getattr(self.model, field) for field in fields]
+        statement = select(*columns).order_by(self.model.id).execution_options(yield_per=batch_size)
+        async with self.session_factory() as session:
+            result = await session.stream(statement)
+            async for partition in result.mappings().partitions():
+                yield partition
+
+    async def create(self, schema):
+        async with self.session_factory() as session:
             try:
                 query = self.model(**schema.model_dump(), id=None)
                 session.add(query)
-                session.commit()
-                session.refresh(query)
+                await session.flush()
+                await session.refresh(query)
             except IntegrityError as e:
                 raise DuplicatedError(message="The value already exists") from e
             return query
-    def update(self, id: int, schema):
-        with self.session_factory() as session:
-            session.query(self.model).filter(self.model.id == id).update(schema.model_dump(exclude_none=True))
-            session.commit()
-            return self.read_by_field("id", id)
-
-    def delete_by_id(self, id: int):
-        with self.session_factory() as session:
-            query = session.query(self.model).filter(self.model.id == id).first()
+
+    async def update(self, id: int, schema, **values):
+        """Update the row from ``schema``; ``values`` are extra column values or expressions."""
+        async with self.session_factory() as session:
+            statement = (
+                update(self.model)
+                .where(self.model.id == id)
+                .values(**schema.model_dump(exclude_none=True), **values)
+                .returning(self.model)
+                .execution_options(populate_existing=True)
+            )
+            result = await session.execute(statement)
+            query = result.scalars().first()
             if not query:
                 raise NotFoundError(message=f"not found id : {id}")
-            session.delete(query)
-            session.commit()
+            return query
+
+    async def delete_by_id(self, id: int):
+        async with self.session_factory() as session:
+            result = await session.execute(select(self.model).where(self.model.id == id))
+            query = result.scalars().first()
+            if not query:
+                raise NotFoundError(message=f"not found id : {id}")
+            await session.delete(query)
+            await session.flush()
+
+    async def find_one(self, field_name, value):
+        async with self.session_factory() as session:
+            result = await session.execute(select(self.model).where(getattr(self.model, field_name) == value))
+            return result.scalars().first()
+
+    async def find_many(self, field_name, values):
+        async with self.session_factory() as session:
+            result = await session.execute(select(self.model).where(getattr(self.model, field_name).in_(values)))
+            return result.scalars().all()
+
+    async def create_many(self, schemas):
+        """Insert all rows with one multi-row INSERT; rows violating a unique constraint are skipped.
+
+        Returns the rows that were actually inserted.
+        """
+        if not schemas:
+            return []
+        async with self.session_factory() as session:
+            statement = self._insert_ignoring_conflicts(session).returning(self.model)
+            result = await session.execute(statement, [schema.model_dump() for schema in schemas])
+            return result.scalars().all()
+
+    async def update_many(self, rows):
+        """Update rows by primary key in one executemany UPDATE; every row must contain ``id``."""
+        if not rows:
+            return
+        async with self.session_factory() as session:
+            try:
+                await session.execute(update(self.model), rows)
+                await session.flush()
+            except IntegrityError as e:
+                raise DuplicatedError(message="The value already exists") from e
+
+    async def delete_many(self, ids):
+        """Delete all ids with one statement and return the ids that existed."""
+        if not ids:
+            return []
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(self.model).where(self.model.id.in_(ids)).returning(self.model.id)
+            )
+            return result.scalars().all()
+
+    def _page_statement(self, statement, limit: int, cursor: str = None, where=(), sort: str = "id"):
+        """Keyset pagination: ``ORDER BY sort, id`` and ``WHERE (sort, id) > cursor``."""
+        descending = sort.startswith("-")
+        column = getattr(self.model, sort.lstrip("-"))
+        keys = [self.model.id] if column is self.model.id else [column, self.model.id]
+        statement = statement.where(*where).order_by(*(key.desc() if descending else key for key in keys))
+        if cursor:
+            position = tuple_(*keys) if len(keys) > 1 else keys[0]
+            last = self._decode_position(cursor, len(keys))
+            statement = statement.where(position < last if descending else position > last)
+        return statement.limit(limit + 1)
+
+    @staticmethod
+    def _encode_position(sort: str, value, id: int) -> str:
+        return encode_cursor(id if sort.lstrip("-") == "id" else [value, id])
+
+    @staticmethod
+    def _decode_position(cursor: str, size: int):
+        position = decode_cursor(cursor)
+        if size == 1 and isinstance(position, int):
+            return position
+        if size > 1 and isinstance(position, list) and len(position) == size and isinstance(position[-1], int):
+            return tuple_(*(literal(value) for value in position))
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
 
-    def find_one(self, field_name, value):
-        with self.session_factory() as session:
-            query = session.query(self.model)
-            return query.filter(getattr(self.model, field_name) == value).first()
\ No newline at end of file
+    def _insert_ignoring_conflicts(self, session):
+        dialect = session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(self.model).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite.insert(self.model).on_conflict_do_nothing()
+        return insert(self.model)
@@ -1,12 +1,119 @@
-from contextlib import AbstractContextManager
-from typing import Callable
+import uuid
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, List
 
 from core.models.character import Character
 from core.repository.base_repository import BaseRepository
-from sqlalchemy.orm import Session
+from core.schema.character_schema import CharacterFilter
+from fastapi import HTTPException
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def fts_trigram_query(query: str) -> str:
+    """FTS5 query matching any trigram of ``query``, so bm25 ranks rows by shared trigrams."""
+    query = query.lower()
+    trigrams = dict.fromkeys(query[i:i + 3] for i in range(len(query) - 2))
+    return " OR ".join('"' + trigram.replace('"', '""') + '"' for trigram in trigrams)
 
 
 class CharacterRepository(BaseRepository):
-    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+    def __init__(self, session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]]):
         self.session_factory = session_factory
         super().__init__(session_factory, Character)
+
+    def filter_clauses(self, filters: CharacterFilter) -> list:
+        """Compile ``filters`` into WHERE clauses that one ``(column, id)`` index serves in keyset order.
+
+        That is either one exact-match filter sorted by id, or ranges on the sort key; any other
+        combination would scan every row the index walks past, so it is rejected with 422.
+        """
+        equal = [field for field in ("hair_color", "skin_color", "eye_color", "user_id")
+                 if getattr(filters, field) is not None]
+        ranged = [field for field in ("height", "mass")
+                  if getattr(filters, f"min_{field}") is not None or getattr(filters, f"max_{field}") is not None]
+        sort = filters.sort.lstrip("-")
+        if equal and (len(equal) > 1 or ranged or sort != "id"):
+            raise HTTPException(
+                status_code=422, detail="Filter on one of hair_color, skin_color, eye_color or user_id, sorted by id."
+            )
+        if any(field != sort for field in ranged):
+            raise HTTPException(status_code=422, detail="A height or mass range must be sorted by that column.")
+
+        clauses = [getattr(self.model, field) == getattr(filters, field) for field in equal]
+        for field in ranged:
+            low, high = getattr(filters, f"min_{field}"), getattr(filters, f"max_{field}")
+            if low is not None:
+                clauses.append(getattr(self.model, field) >= low)
+            if high is not None:
+                clauses.append(getattr(self.model, field) <= high)
+        return clauses
+
+    async def search(self, fields, query: str, limit: int) -> List[dict]:
+        """Names starting with ``query`` first, then the closest fuzzy matches; at most ``limit`` rows.
+
+        Postgres matches with the ``pg_trgm`` GIN index (prefix ILIKE or trigram similarity),
+        SQLite with the ``characters_fts`` trigram FTS5 table, ranked by bm25 over the query's
+        trigrams. ``query`` must be at least three characters long for either index to apply.
+        """
+        columns = [getattr(self.model, field) for field in fields]
+        prefix = self.model.name.ilike(escape_like(query) + "%", escape="\\")
+        async with self.session_factory() as session:
+            dialect = session.bind.dialect.name
+            statement = select(*columns)
+            if dialect == "postgresql":
+                statement = statement.where(or_(prefix, self.model.name.op("%")(query))).order_by(
+                    prefix.desc(), func.similarity(self.model.name, query).desc(), self.model.name
+                )
+            elif dialect == "sqlite":
+                fts = literal_column("characters_fts")
+                fts_table = table("characters_fts", column("rowid"))
+                statement = (
+                    statement.join(fts_table, fts_table.c.rowid == self.model.id)
+                    .where(fts.op("MATCH")(fts_trigram_query(query)))
+                    .order_by(prefix.desc(), func.bm25(fts), self.model.name)
+                )
+            else:
+                statement = statement.where(prefix).order_by(self.model.name)
+            result = await session.execute(statement.limit(limit))
+            return [dict(zip(fields, row)) for row in result.tuples().all()]
+
+    async def import_many(self, schemas) -> List[str]:
+        """Insert one import chunk, skipping names that already exist; returns the inserted names.
+
+        On Postgres (asyncpg) the chunk is COPYed into a temporary table and moved over with
+        INSERT ... SELECT, elsewhere it is a multi-row INSERT.
+        """
+        if not schemas:
+            return []
+        rows = [schema.model_dump() for schema in schemas]
+        async with self.session_factory() as session:
+            if session.bind.dialect.driver == "asyncpg":
+                return await self._copy_many(session, rows)
+            statement = self._insert_ignoring_conflicts(session).returning(self.model.name)
+            result = await session.execute(statement, rows)
+            return result.scalars().all()
+
+    async def _copy_many(self, session: AsyncSession, rows: List[dict]) -> List[str]:
+        table = f"characters_import_{uuid.uuid4().hex}"
+        columns = ", ".join(rows[0])
+        await session.execute(text(
+            f"CREATE TEMP TABLE {table} ON COMMIT DROP AS SELECT {columns} FROM characters WITH NO DATA"
+        ))
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table, records=[tuple(row.values()) for row in rows], columns=list(rows[0])
+        )
+        result = await session.execute(text(
+            f"INSERT INTO characters ({columns}, created_at, updated_at) "
+            f"SELECT {columns}, now(), now() FROM {table} "
+            f"ON CONFLICT DO NOTHING RETURNING name"
+        ))
+        names = result.scalars().all()
+        await session.execute(text(f"DROP TABLE {table}"))
+        return names
@@ -1,12 +1,85 @@
-from contextlib import AbstractContextManager
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta
 from typing import Callable
 
+from core.models.list_version import ListVersion
 from core.models.user import User
+from core.models.user_revocation import UserRevocation
 from core.repository.base_repository import BaseRepository
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+LIST_VERSION = "users"
 
 
 class UserRepository(BaseRepository):
-    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]):
+    """Every write also bumps the ``users`` row of ``list_versions``, in the same transaction,
+    the version behind the users list ETag; all services writing users go through these methods."""
+
+    def __init__(self, session_factory: Callable[..., AbstractAsyncContextManager[AsyncSession]],
+                 token_lifetime: int):
         self.session_factory = session_factory
+        # tombstones outlive every token of the deleted user; a day of slack covers clock skew
+        self.revocation_retention = timedelta(minutes=token_lifetime, days=1)
         super().__init__(session_factory, User)
+
+    async def create(self, schema):
+        user = await super().create(schema)
+        await self._bump_list_version()
+        return user
+
+    async def update(self, id: int, schema, **values):
+        """Update the user and bump its ``token_version``, outdating the claims of its tokens."""
+        user = await super().update(id, schema, token_version=self.model.token_version + 1, **values)
+        await self._bump_list_version()
+        return user
+
+    async def delete_by_id(self, id: int):
+        """Delete the user and leave a tombstone, in the same transaction, revoking its tokens."""
+        await super().delete_by_id(id)
+        async with self.session_factory() as session:
+            session.add(UserRevocation(user_id=id))
+            await session.execute(
+                delete(UserRevocation).where(UserRevocation.created_at < datetime.utcnow() - self.revocation_retention)
+            )
+            await session.flush()
+        await self._bump_list_version()
+
+    async def read_list_version(self) -> int:
+        async with self.session_factory() as session:
+            version = await session.scalar(select(ListVersion.version).where(ListVersion.name == LIST_VERSION))
+            return version or 0
+
+    async def _bump_list_version(self) -> None:
+        # the row lock orders concurrent writers, so each commit publishes a distinct version
+        async with self.session_factory() as session:
+            insert = postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+            await session.execute(
+                insert(ListVersion).values(name=LIST_VERSION, version=1).on_conflict_do_update(
+                    index_elements=[ListVersion.name], set_={"version": ListVersion.version + 1}
+                )
+            )
+
+    async def read_token_versions(self, since=None):
+        """The database clock, with ``(id, token_version, updated_at)`` of users updated since
+        ``since`` followed by ``(id, None, deleted_at)`` for users deleted since then (from their
+        tombstones). Without ``since`` it goes back ``revocation_retention``: older changes only
+        concern expired tokens."""
+        async with self.session_factory() as session:
+            # the clock updated_at and created_at default to, naive like them
+            now = func.localtimestamp if session.bind.dialect.name == "postgresql" else func.now
+            clock = await session.scalar(select(now()))
+            if since is None:
+                since = clock - self.revocation_retention
+            result = await session.execute(
+                select(self.model.id, self.model.token_version, self.model.updated_at)
+                .where(self.model.updated_at >= since)
+            )
+            changes = result.tuples().all()
+            result = await session.execute(
+                select(UserRevocation.user_id, literal(None), UserRevocation.created_at)
+                .where(UserRevocation.created_at >= since)
+            )
+            return clock, [*changes, *result.tuples().all()]
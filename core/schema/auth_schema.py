@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
 
 
 class SignIn(BaseModel):
@@ -15,8 +17,45 @@ class SignUp(SignIn):
 class Payload(BaseModel):
     id: int
     email: str
-    first_name: str
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    ver: int = 0  # users.token_version when the token was issued
+
+    @classmethod
+    def for_user(cls, user) -> "Payload":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            ver=user.token_version,
+        )
+
+
+class Claims(Payload):
+    """Claims of a verified access token."""
+    exp: int
+
+
+class Principal(BaseModel):
+    """The authenticated user as handlers see it, built from token claims or the users row."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
 
 
 class SignInResponse(BaseModel):
     access_token: str
+
+
+class TokenIntrospection(BaseModel):
+    """Verdict on one token; ``claims`` reflect the user as it is now, not as it was at issue."""
+    active: bool
+    exp: Optional[int] = None
+    claims: Optional[Principal] = None
@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
 
 class ModelBaseInfo(BaseModel):
     id: int = None
@@ -11,3 +14,32 @@ class ModelBaseInfo(BaseModel):
 
 class Blank(BaseModel):
     pass
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[BulkItemResult]
+
+
+class ImportReject(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    processed: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    rejects: List[ImportReject] = []
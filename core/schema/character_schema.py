@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from core.schema.base_schema import ModelBaseInfo
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class BaseCharacter(BaseModel):
@@ -27,3 +27,25 @@ class PostCharacter(BaseCharacter):
 
 class UpdateCharacter(BaseCharacter):
     ...
+
+
+class BulkUpdateCharacter(UpdateCharacter):
+    id: int
+
+
+class CharacterFilter(BaseModel):
+    """Query parameters of ``GET /characters``; every field maps to an indexed column and
+    ``CharacterRepository.filter_clauses`` only accepts combinations one index serves."""
+    hair_color: Optional[str] = None
+    skin_color: Optional[str] = None
+    eye_color: Optional[str] = None
+    user_id: Optional[int] = None
+    min_height: Optional[float] = None
+    max_height: Optional[float] = None
+    min_mass: Optional[float] = None
+    max_mass: Optional[float] = None
+    sort: Literal["id", "-id", "name", "-name", "height", "-height", "mass", "-mass"] = "id"
+
+
+CHARACTER_FIELDS = list(Character.model_fields)
+CHARACTER_ADAPTER = TypeAdapter(Character)
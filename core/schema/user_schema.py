@@ -18,3 +18,6 @@ class User(BaseUser):
 
 class UpdateUser(BaseUser):
     ...
+
+
+USER_FIELDS = list(User.model_fields)
@@ -1,15 +1,33 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 
-from jwt import encode, decode
+from jwt import encode, decode, get_unverified_header
 
+from core.cache import LRUCache
 from core.exceptions import AuthError
-from fastapi import Request
+from core.keys import KeyRing
+from core.schema.auth_schema import Claims, Payload
+from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from config import settings
 from passlib.context import CryptContext
+from pydantic import ValidationError
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-ALGORITHM = "HS256"
+LEGACY_ALGORITHM = "HS256"
+
+key_ring = KeyRing(
+    algorithm=settings.jwt_algorithm,
+    rotation_interval=settings.jwt_key_rotation_interval,
+    activation_delay=settings.jwks_max_age,
+    retention=settings.access_token_expire * 60,
+    reload_interval=settings.jwt_key_reload_interval,
+)
 
 
 def create_access_token(subject: dict, expires_delta: timedelta = None) -> (str, str):
@@ -18,7 +36,8 @@ def create_access_token(subject: dict, expires_delta: timedelta = None) -> (str,
     else:
         expire = datetime.now() + timedelta(minutes=settings.access_token_expire)
     payload = {"exp": expire, **subject}
-    encoded_jwt = encode(payload, settings.secret_key, algorithm=ALGORITHM)
+    key = key_ring.signing_key()
+    encoded_jwt = encode(payload, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
     expiration_datetime = expire.strftime(settings.datetime_format)
     return encoded_jwt, expiration_datetime
 
@@ -31,41 +50,146 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class HashingPool:
+    """Runs bcrypt off the event loop with bounded concurrency.
+
+    At most ``max_workers`` hashes run at once and at most ``queue_size`` more may wait;
+    past that callers get a 503 instead of piling up behind a login storm.
+    """
+
+    def __init__(self, executor: str, max_workers: int, queue_size: int) -> None:
+        self.executor = executor
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_size
+        self.pending = 0
+        self._executor: Executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor == "thread":
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hashing")
+            else:
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.capacity:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many concurrent authentication requests, retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    executor=settings.hashing_executor,
+    max_workers=settings.hashing_max_workers,
+    queue_size=settings.hashing_queue_size,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
+
+
 def decode_jwt(token: str) -> dict:
+    """Verify against the key ring by ``kid``; tokens without one are legacy HS256 tokens."""
     try:
-        decoded_token = decode(token, settings.secret_key, algorithms=ALGORITHM)
+        kid = get_unverified_header(token).get("kid")
+        if kid is not None:
+            key = key_ring.verification_key(kid)
+            if key is None:
+                return {}
+            decoded_token = decode(token, key.public_key, algorithms=[key.algorithm])
+        elif settings.jwt_accept_legacy_tokens:
+            decoded_token = decode(token, settings.secret_key, algorithms=[LEGACY_ALGORITHM])
+        else:
+            return {}
         return decoded_token if decoded_token["exp"] >= int(round(datetime.utcnow().timestamp())) else None
     except Exception:
         return {}
 
 
+class VerifiedTokens:
+    """Parsed claims of tokens whose signature already checked out, keyed by a digest of the token.
+
+    Entries expire at the token's own ``exp``, so a hit never outlives the check it stands in
+    for, and a repeat token costs a hash and a dict lookup. Tokens that fail verification are
+    not cached. Revocation is not decided here: ``UserService.get_principal`` checks the claims'
+    token version on every request, hit or miss.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.cache = LRUCache(maxsize, ttl=0)
+
+    def decode(self, token: str) -> Optional[Claims]:
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        claims = self.cache.get(key)
+        if claims is None:
+            try:
+                claims = Claims(**decode_jwt(token))
+            except (TypeError, ValidationError):
+                return None
+            self.cache.set(key, claims, ttl=claims.exp - time.time())
+        return claims
+
+
+verified_tokens = VerifiedTokens(maxsize=settings.token_cache_size)
+
+
 class JWTBearer(HTTPBearer):
+    """Verifies the bearer token once per request, and a repeat token only once until it expires.
+
+    The parsed ``Payload`` is kept on ``request.state.token_payload`` so later dependencies
+    reuse it instead of decoding the token again; across requests it comes from
+    ``verified_tokens``.
+    """
+
     def __init__(self, auto_error: bool = True):
         super(JWTBearer, self).__init__(auto_error=auto_error)
 
-    async def __call__(self, request: Request):
+    async def __call__(self, request: Request) -> Payload:
+        payload = getattr(request.state, "token_payload", None)
+        if payload is not None:
+            return payload
+
         credentials: HTTPAuthorizationCredentials = await super(JWTBearer, self).__call__(request)
         if credentials:
             if not credentials.scheme == "Bearer":
                 raise AuthError(message="Invalid authentication scheme.")
-            if not self.verify_jwt(credentials.credentials):
+            payload = self.verify_jwt(credentials.credentials)
+            if not payload:
                 raise AuthError(message="Invalid token or expired token.")
-            return credentials.credentials
+            request.state.token_payload = payload
+            return payload
         else:
             raise AuthError(message="Invalid authorization code.")
 
-    def verify_jwt(self, jwt_token: str) -> bool:
-        is_token_valid: bool = False
-        try:
-            payload = decode_jwt(jwt_token)
-        except Exception:
-            payload = None
-        if payload:
-            is_token_valid = True
-        return is_token_valid
+    def verify_jwt(self, jwt_token: str) -> Optional[Payload]:
+        return verified_tokens.decode(jwt_token)
 
     def create_jwt_token(data: dict):
         to_encode = data.copy()
         expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
-        return encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
+        return encode(to_encode, SECRET_KEY, algorithm=LEGACY_ALGORITHM)
+
+
+jwt_bearer = JWTBearer()
@@ -0,0 +1,29 @@
+from typing import Dict, List, Optional
+
+import orjson
+from fastapi.responses import Response
+
+from core.etag import set_etag
+
+
+def dump_page(items: List[Dict], next_cursor: Optional[str]) -> bytes:
+    """Serialize a page of plain row dicts straight to JSON, skipping pydantic.
+
+    Rows must hold the response schema's fields in its order, which is what
+    ``BaseRepository.read_rows`` with ``list(Schema.model_fields)`` returns; the output then
+    matches what FastAPI renders for ``Page[Schema]``.
+    """
+    return orjson.dumps({"items": items, "next_cursor": next_cursor})
+
+
+def dump_items(items: List[Dict]) -> bytes:
+    """Like ``dump_page`` for a bare list of rows."""
+    return orjson.dumps(items)
+
+
+def json_response(content: bytes, etag: Optional[str] = None) -> Response:
+    """Send already serialized JSON; FastAPI does not validate or re-encode a ``Response``."""
+    response = Response(content, media_type="application/json")
+    if etag:
+        set_etag(response, etag)
+    return response
@@ -2,7 +2,7 @@ from datetime import timedelta
 
 from core.exceptions import AuthError
 from core.models.user import User
-from core.security import create_access_token, get_password_hash, verify_password
+from core.security import create_access_token, hash_password_async, verify_password_async
 from core.repository.user_repository import UserRepository
 from config import settings
 from core.schema.auth_schema import Payload, SignIn, SignUp
@@ -12,31 +12,27 @@ class AuthService:
     def __init__(self, user_repository: UserRepository):
         self.repository = user_repository
 
-    def get_list(self):
-        return self.repository.read()
+    async def get_list(self, limit: int, cursor: str = None):
+        return await self.repository.read(limit, cursor)
 
-    def add(self, schema):
-        return self.repository.create(schema)
+    async def add(self, schema):
+        return await self.repository.create(schema)
 
-    def patch(self, id: int, schema):
-        return self.repository.update(id, schema)
+    async def patch(self, id: int, schema):
+        return await self.repository.update(id, schema)
 
-    def remove_by_id(self, id):
-        return self.repository.delete_by_id(id)
+    async def remove_by_id(self, id):
+        return await self.repository.delete_by_id(id)
 
-    def sign_in(self, sign_in: SignIn):
-        user: User = self.repository.read_by_field("email", sign_in.email)
+    async def sign_in(self, sign_in: SignIn):
+        user: User = await self.repository.read_by_field("email", sign_in.email)
         if not user:
             raise AuthError(message="Incorrect email or password")
 
-        if not verify_password(sign_in.password, user.password):
+        if not await verify_password_async(sign_in.password, user.password):
             raise AuthError(message="Incorrect password")
 
-        payload = Payload(
-            id=user.id,
-            email=user.email,
-            first_name=user.first_name
-        )
+        payload = Payload.for_user(user)
         token_lifespan = timedelta(minutes=settings.access_token_expire)
         access_token, expiration_datetime = create_access_token(payload.model_dump(), token_lifespan)
         response = {
@@ -44,18 +40,18 @@ class AuthService:
         }
         return response
 
-    def sign_up(self, user: SignUp):
-        existing_user = self.repository.find_one("email", user.email)
+    async def sign_up(self, user: SignUp):
+        existing_user = await self.repository.find_one("email", user.email)
 
         if existing_user:
             if not existing_user.password:
-                user.password = get_password_hash(user.password)
-                updated_user = self.repository.update(existing_user.id, user)
+                user.password = await hash_password_async(user.password)
+                updated_user = await self.repository.update(existing_user.id, user)
                 return updated_user
             # else:
             #     raise HTTPException(status_code=400, detail="El correo ya está registrado.")
 
-        user.password = get_password_hash(user_data.password)
-        created = self.repository.create(user)
+        user.password = await hash_password_async(user.password)
+        created = await self.repository.create(user)
         return created
 
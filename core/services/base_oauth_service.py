@@ -1,5 +1,5 @@
 from typing import Dict, Any, Optional
-from httpx import AsyncClient
+from core.http import ProviderClient
 from fastapi import HTTPException
 from datetime import timedelta
 
@@ -13,7 +13,7 @@ from core.security import create_access_token
 class BaseOAuthService:
     def __init__(self, client_id: str, client_secret: str, redirect_uri: str,
                  token_url: str, access_token_expire: int,
-                 user_repository: UserRepository, http_client: AsyncClient):
+                 user_repository: UserRepository, http_client: ProviderClient):
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
@@ -45,10 +45,10 @@ class BaseOAuthService:
             first_name: Optional[str],
             last_name: Optional[str]
     ) -> Dict[str, str]:
-        user = self._get_or_create_user(email, username, first_name, last_name)
+        user = await self._get_or_create_user(email, username, first_name, last_name)
         return self._generate_token_for_user(user)
 
-    def _get_or_create_user(
+    async def _get_or_create_user(
             self,
             email: str,
             username: str,
@@ -58,7 +58,7 @@ class BaseOAuthService:
         if not email:
             raise HTTPException(status_code=400, detail="Email no disponible o no verificado.")
 
-        user = self.repository.find_one("email", email)
+        user = await self.repository.find_one("email", email)
         if user:
             return user
 
@@ -68,14 +68,10 @@ class BaseOAuthService:
             first_name=first_name,
             last_name=last_name
         )
-        return self.repository.create(new_user)
+        return await self.repository.create(new_user)
 
     def _generate_token_for_user(self, user: User) -> Dict[str, str]:
-        payload = Payload(
-            id=user.id,
-            email=user.email,
-            first_name=user.first_name
-        ).model_dump()
+        payload = Payload.for_user(user).model_dump()
 
         token_lifespan = timedelta(minutes=self.access_token_expire)
         access_token, _ = create_access_token(payload, token_lifespan)
@@ -1,22 +1,182 @@
+from typing import AsyncIterator, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from core.cache import ReadThroughCache
+from core.importer import Record
 from core.repository.character_repository import CharacterRepository
+from core.schema.base_schema import BulkItemResult, BulkResult, ImportReject, ImportResult
+from core.schema.character_schema import (
+    CHARACTER_ADAPTER, CHARACTER_FIELDS, BulkUpdateCharacter, CharacterFilter, PostCharacter
+)
+from core.serialization import dump_items, dump_page
+from logger_config import logger
 
 
 class CharacterService:
 
-    def __init__(self, character_repository: CharacterRepository):
+    def __init__(self, character_repository: CharacterRepository, cache: ReadThroughCache):
         self.repository = character_repository
+        self.cache = cache
+
+    async def get_list_json(self, limit: int, cursor: str = None, filters: CharacterFilter = None) -> bytes:
+        """Return the page as serialized ``Page[Character]`` JSON."""
+        filters = filters or CharacterFilter()
+        clauses = self.repository.filter_clauses(filters)
+
+        async def load() -> bytes:
+            page = await self.repository.read_rows(CHARACTER_FIELDS, limit, cursor, clauses, filters.sort)
+            return dump_page(page["items"], page["next_cursor"])
+
+        key = f"{limit}:{cursor}:{filters.model_dump_json(exclude_defaults=True)}"
+        return await self.cache.get_list_json(key, load)
+
+    async def search_json(self, query: str, limit: int) -> bytes:
+        """Return the best matches for ``query`` as serialized ``List[Character]`` JSON."""
+        return dump_items(await self.repository.search(CHARACTER_FIELDS, query, limit))
+
+    async def get_list_generation(self) -> str:
+        return await self.cache.generation.current()
+
+    def stream(self, fields, batch_size: int):
+        return self.repository.stream(fields, batch_size)
+
+    async def add(self, schema):
+        character = await self.repository.create(schema)
+        await self.cache.invalidate()
+        return character
+
+    async def patch(self, id: int, schema):
+        character = await self.repository.update(id, schema)
+        await self.cache.invalidate(f"id:{id}")
+        return character
+
+    async def remove_by_id(self, id):
+        await self.repository.delete_by_id(id)
+        await self.cache.invalidate(f"id:{id}")
+
+    async def get_by_field(self, field, id):
+        if field != "id":
+            return await self.repository.read_by_field(field, id)
+        return await self.cache.get(f"id:{id}", CHARACTER_ADAPTER, lambda: self.repository.read_by_field(field, id))
+
+    async def get_version(self, id: int):
+        cached = await self.cache.peek(f"id:{id}", CHARACTER_ADAPTER)
+        if cached is not None:
+            return cached.updated_at
+        return await self.repository.read_version(id)
+
+    async def add_many(self, schemas: List[PostCharacter]) -> BulkResult:
+        errors = self._duplicates_in_batch([schema.name for schema in schemas], "name")
+        pending = [schema for index, schema in enumerate(schemas) if index not in errors]
+        created = {character.name: character.id for character in await self.repository.create_many(pending)}
+        if created:
+            await self.cache.invalidate()
+
+        items = []
+        for index, schema in enumerate(schemas):
+            if index in errors:
+                items.append(BulkItemResult(index=index, error=errors[index]))
+            elif schema.name in created:
+                items.append(BulkItemResult(index=index, id=created[schema.name]))
+            else:
+                items.append(BulkItemResult(index=index, error=f"name already exists: {schema.name}"))
+        return self._bulk_result(items)
+
+    async def patch_many(self, schemas: List[BulkUpdateCharacter]) -> BulkResult:
+        errors = self._duplicates_in_batch([schema.id for schema in schemas], "id")
+        errors.update(self._duplicates_in_batch([schema.name for schema in schemas], "name"))
+        existing = {c.id for c in await self.repository.find_many("id", [schema.id for schema in schemas])}
+        taken = {c.name: c.id for c in await self.repository.find_many("name", [schema.name for schema in schemas])}
+
+        rows = []
+        for index, schema in enumerate(schemas):
+            if index in errors:
+                continue
+            if schema.id not in existing:
+                errors[index] = f"not found id : {schema.id}"
+            elif taken.get(schema.name, schema.id) != schema.id:
+                errors[index] = f"name already exists: {schema.name}"
+            else:
+                rows.append(schema.model_dump(exclude_none=True))
+        await self.repository.update_many(rows)
+        if rows:
+            await self.cache.invalidate(*(f"id:{row['id']}" for row in rows))
+
+        items = [
+            BulkItemResult(index=index, error=errors[index]) if index in errors
+            else BulkItemResult(index=index, id=schema.id)
+            for index, schema in enumerate(schemas)
+        ]
+        return self._bulk_result(items)
+
+    async def remove_many(self, ids: List[int]) -> BulkResult:
+        deleted = set(await self.repository.delete_many(ids))
+        if deleted:
+            await self.cache.invalidate(*(f"id:{id}" for id in deleted))
+        items = [
+            BulkItemResult(index=index, id=id) if id in deleted
+            else BulkItemResult(index=index, id=id, error=f"not found id : {id}")
+            for index, id in enumerate(ids)
+        ]
+        return self._bulk_result(items)
+
+    async def import_records(self, records: AsyncIterator[Tuple[int, Record]], user_id: int,
+                             batch_size: int, max_rejects: int) -> ImportResult:
+        """Insert ``records`` in chunks of ``batch_size``, invalidating the cache after each chunk."""
+        result = ImportResult()
+        batch: Dict[str, int] = {}
 
-    def get_list(self):
-        return self.repository.read()
+        def reject(line: int, error: str) -> None:
+            result.rejected += 1
+            if len(result.rejects) < max_rejects:
+                result.rejects.append(ImportReject(line=line, error=error))
 
-    def add(self, schema):
-        return self.repository.create(schema)
+        async def flush() -> None:
+            inserted = set(await self.repository.import_many(rows))
+            result.inserted += len(inserted)
+            if inserted:
+                await self.cache.invalidate()
+            for name, line in batch.items():
+                if name not in inserted:
+                    reject(line, f"name already exists: {name}")
+            batch.clear()
+            rows.clear()
+            logger.info(f"character import: {result.processed} processed, {result.inserted} inserted, "
+                        f"{result.rejected} rejected")
 
-    def patch(self, id: int, schema):
-        return self.repository.update(id, schema)
+        rows: List[PostCharacter] = []
+        async for line, record in records:
+            result.processed += 1
+            if isinstance(record, str):
+                reject(line, record)
+                continue
+            try:
+                character = PostCharacter.model_validate({**record, "user_id": user_id})
+            except ValidationError as e:
+                reject(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                continue
+            if character.name in batch:
+                reject(line, f"duplicate name in import: {character.name}")
+                continue
+            batch[character.name] = line
+            rows.append(character)
+            if len(rows) >= batch_size:
+                await flush()
+        if rows:
+            await flush()
+        return result
 
-    def remove_by_id(self, id):
-        return self.repository.delete_by_id(id)
+    @staticmethod
+    def _duplicates_in_batch(values: list, field: str) -> Dict[int, str]:
+        seen, errors = set(), {}
+        for index, value in enumerate(values):
+            if value in seen:
+                errors[index] = f"duplicate {field} in request: {value}"
+            seen.add(value)
+        return errors
 
-    def get_by_field(self, field, id):
-        return self.repository.read_by_field(field, id)
\ No newline at end of file
+    @staticmethod
+    def _bulk_result(items: List[BulkItemResult]) -> BulkResult:
+        failed = sum(1 for item in items if item.error)
+        return BulkResult(succeeded=len(items) - failed, failed=failed, items=items)
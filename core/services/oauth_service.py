@@ -1,11 +1,16 @@
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Coroutine
+from typing import Dict, Any, Optional, Coroutine, Tuple
 
 from fastapi import HTTPException
-from jwt import PyJWTError, algorithms, decode, get_unverified_header
+from httpx import HTTPError
+from jwt import PyJWTError, decode, get_unverified_header
 from starlette.responses import RedirectResponse
 
 from config import settings
+from core.cache import LRUCache
+from core.jwks import JWKSCache
 from core.services.base_oauth_service import BaseOAuthService
 
 
@@ -20,10 +25,10 @@ class OAuthService(ABC):
 
 
 class GoogleOAuthService(OAuthService, BaseOAuthService):
-    def __init__(self, auth_url: str, jwks_url: str, *args, **kwargs):
+    def __init__(self, auth_url: str, jwks_cache: JWKSCache, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.auth_url = auth_url
-        self.jwks_url = jwks_url
+        self.jwks_cache = jwks_cache
 
     async def get_login_url(self) -> str:
         return (
@@ -56,10 +61,8 @@ class GoogleOAuthService(OAuthService, BaseOAuthService):
         return RedirectResponse(url=f"{settings.frontend_url}/oauth/callback?access_token={response['access_token']}")
 
     async def _verify_id_token(self, id_token: str, access_token: str) -> Dict[str, Any]:
-        jwks = (await self.http_client.get(self.jwks_url)).json()
-        public_keys = {key["kid"]: algorithms.RSAAlgorithm.from_jwk(key) for key in jwks["keys"]}
         headers = get_unverified_header(id_token)
-        key = public_keys.get(headers["kid"])
+        key = await self.jwks_cache.get_key(headers["kid"])
 
         if not key:
             raise HTTPException(status_code=401, detail="Clave pública no encontrada.")
@@ -77,10 +80,13 @@ class GoogleOAuthService(OAuthService, BaseOAuthService):
 
 
 class GitHubOAuthService(OAuthService, BaseOAuthService):
-    def __init__(self, auth_url: str, user_info_url: str, *args, **kwargs):
+    def __init__(self, auth_url: str, user_info_url: str, profile_cache: LRUCache,
+                 lookup_budget: float, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.auth_url = auth_url
         self.user_info_url = user_info_url
+        self.profile_cache = profile_cache
+        self.lookup_budget = lookup_budget
 
     async def get_login_url(self) -> str:
         return f"{self.auth_url}?client_id={self.client_id}&redirect_uri={self.redirect_uri}&scope=user:email"
@@ -95,8 +101,7 @@ class GitHubOAuthService(OAuthService, BaseOAuthService):
         if not access_token:
             raise HTTPException(status_code=401, detail="Access token no recibido.")
 
-        user_info = await self._get_user_info(access_token)
-        email = user_info.get("email") or await self._get_primary_email(access_token)
+        user_info, email = await self._get_profile(access_token)
 
         response = await self.handle_oauth_user_login(
             email,
@@ -107,6 +112,38 @@ class GitHubOAuthService(OAuthService, BaseOAuthService):
 
         return RedirectResponse(url=f"{settings.frontend_url}/oauth/callback?access_token={response['access_token']}")
 
+    async def _get_profile(self, token: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Fetch the profile and the verified primary email concurrently, within ``lookup_budget``.
+
+        Results are cached briefly per access token (keyed by its digest).
+        """
+        key = hashlib.sha256(token.encode()).hexdigest()
+        profile = self.profile_cache.get(key)
+        if profile is not None:
+            return profile
+
+        try:
+            async with asyncio.timeout(self.lookup_budget):
+                async with asyncio.TaskGroup() as group:
+                    user_info = group.create_task(self._get_user_info(token))
+                    primary_email = group.create_task(self._get_primary_email_or_none(token))
+        except TimeoutError:
+            raise HTTPException(status_code=504, detail="GitHub no respondió a tiempo.")
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+
+        profile = (user_info.result(), user_info.result().get("email") or primary_email.result())
+        self.profile_cache.set(key, profile)
+        return profile
+
+    async def _get_primary_email_or_none(self, token: str) -> Optional[str]:
+        # only needed when the profile has no public email, so a failure must not abort the login;
+        # HTTPError covers error statuses, transport errors and an open circuit
+        try:
+            return await self._get_primary_email(token)
+        except HTTPError:
+            return None
+
     async def _get_user_info(self, token: str) -> Dict[str, Any]:
         headers = {
             "Authorization": f"Bearer {token}",
@@ -1,21 +1,81 @@
+from typing import List, Optional
+
+from core.cache import LRUCache
 from core.repository.user_repository import UserRepository
+from core.schema.auth_schema import Payload, Principal, TokenIntrospection
+from core.security import verified_tokens
+from core.schema.user_schema import USER_FIELDS
+from core.serialization import dump_page
+from core.token_versions import TokenVersions
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, principal_cache: LRUCache,
+                 token_versions: TokenVersions):
         self.repository = user_repository
+        self.principal_cache = principal_cache
+        self.token_versions = token_versions
+
+    async def get_list_json(self, limit: int, cursor: str = None) -> bytes:
+        """Return the page as serialized ``Page[User]`` JSON."""
+        page = await self.repository.read_rows(USER_FIELDS, limit, cursor)
+        return dump_page(page["items"], page["next_cursor"])
+
+    async def get_list_version(self) -> int:
+        return await self.repository.read_list_version()
+
+    def stream(self, fields, batch_size: int):
+        return self.repository.stream(fields, batch_size)
+
+    async def add(self, schema):
+        return await self.repository.create(schema)
+
+    async def patch(self, id: int, schema):
+        user = await self.repository.update(id, schema)
+        self.principal_cache.delete(id)
+        self.token_versions.record(id, user.token_version)
+        return user
+
+    async def remove_by_id(self, id):
+        await self.repository.delete_by_id(id)
+        self.principal_cache.delete(id)
+        self.token_versions.revoke(id)
 
-    def get_list(self):
-        return self.repository.read()
+    async def get_by_field(self, field, id):
+        return await self.repository.read_by_field(field, id)
 
-    def add(self, schema):
-        return self.repository.create(schema)
+    async def get_version(self, id: int):
+        return await self.repository.read_version(id)
 
-    def patch(self, id: int, schema):
-        return self.repository.update(id, schema)
+    async def get_principal(self, payload: Payload) -> Optional[Principal]:
+        """Build the principal from the token claims, reading the user only when its token
+        version says the claims are outdated (or the token predates the claims)."""
+        await self.token_versions.sync(self.repository.read_token_versions)
+        if self.token_versions.is_revoked(payload.id):
+            return None
+        if payload.username is not None and self.token_versions.is_current(payload.id, payload.ver):
+            return Principal.model_validate(payload, from_attributes=True)
 
-    def remove_by_id(self, id):
-        return self.repository.delete_by_id(id)
+        user = self.principal_cache.get(payload.id)
+        if user is None:
+            user = await self.repository.find_one("id", payload.id)
+            if user is None:
+                self.token_versions.revoke(payload.id)
+                return None
+            self.principal_cache.set(payload.id, user)
+        self.token_versions.record(user.id, user.token_version)
+        return Principal.model_validate(user)
 
-    def get_by_field(self, field, id):
-        return self.repository.read_by_field(field, id)
\ No newline at end of file
+    async def introspect(self, tokens: List[str]) -> List[TokenIntrospection]:
+        """Verify each token (cached until its ``exp``) and build its principal as
+        ``get_principal`` does; tokens of a deleted user come back inactive on every worker
+        once its next token version poll has read the user's tombstone."""
+        results = []
+        for token in tokens:
+            claims = verified_tokens.decode(token)
+            principal = await self.get_principal(claims) if claims else None
+            if principal is None:
+                results.append(TokenIntrospection(active=False))
+            else:
+                results.append(TokenIntrospection(active=True, exp=claims.exp, claims=principal))
+        return results
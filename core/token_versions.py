@@ -0,0 +1,91 @@
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# rows are re-read this far back so a transaction that committed after a later one is not missed
+SYNC_OVERLAP = timedelta(minutes=1)
+
+# (user id, token version or None once the user was deleted, when it changed)
+Change = Tuple[int, Optional[int], datetime]
+
+
+class TokenVersions:
+    """Compact map of ``user id -> token version`` holding only users whose claims changed.
+
+    Access tokens carry the version they were issued with (``ver``). A user missing from the
+    map never changed, so the claims of any unexpired token are still accurate and the
+    principal can be built from them alone. The map learns about changes made by other
+    workers, and about deleted users from their tombstones, by polling the rows written since
+    the last poll, at most every ``sync_interval`` seconds. An entry is dropped a token lifetime
+    (``token_lifetime`` minutes, plus a day of slack) after it was learned, once every token it
+    outdated or revoked has expired.
+    """
+
+    def __init__(self, sync_interval: float, token_lifetime: int) -> None:
+        self.sync_interval = sync_interval
+        self.retention = timedelta(minutes=token_lifetime, days=1).total_seconds()
+        self._versions: Dict[int, int] = {}
+        self._revoked: Set[int] = set()
+        # user id -> monotonic time the entry can be dropped, in that order
+        self._expires: Dict[int, float] = {}
+        self._since: Optional[datetime] = None
+        self._next_sync = 0.0
+
+    def __len__(self) -> int:
+        return len(self._versions) + len(self._revoked)
+
+    def is_revoked(self, user_id: int) -> bool:
+        return user_id in self._revoked
+
+    def is_current(self, user_id: int, version: int) -> bool:
+        return user_id not in self._revoked and self._versions.get(user_id, 0) <= version
+
+    def record(self, user_id: int, version: int) -> None:
+        if version > self._versions.get(user_id, 0):
+            self._versions[user_id] = version
+            self._keep(user_id)
+
+    def revoke(self, user_id: int) -> None:
+        if user_id not in self._revoked:
+            self._revoked.add(user_id)
+            self._keep(user_id)
+
+    async def sync(
+        self, load_changes: Callable[[Optional[datetime]], Awaitable[Tuple[datetime, List[Change]]]]
+    ) -> None:
+        """Apply ``load_changes(since)``, which returns the database clock along with the changes
+        made since ``since``; ``since`` is ``None`` on the first poll and the clock of the
+        previous poll, less ``SYNC_OVERLAP``, after it."""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        # concurrent requests keep using the current map instead of polling too
+        self._next_sync = now + self.sync_interval
+        try:
+            clock, changes = await load_changes(self._since and self._since - SYNC_OVERLAP)
+        except Exception:
+            self._next_sync = 0.0
+            raise
+        for user_id, version, _ in changes:
+            if version is None:
+                self.revoke(user_id)
+            else:
+                self.record(user_id, version)
+        # advanced even when nothing changed, so every poll reads only the recent rows
+        self._since = clock
+        self._prune(now)
+
+    def _keep(self, user_id: int) -> None:
+        self._expires.pop(user_id, None)
+        self._expires[user_id] = time.monotonic() + self.retention
+
+    def _prune(self, now: float) -> None:
+        expired = []
+        for user_id, expires in self._expires.items():
+            if expires > now:
+                break
+            expired.append(user_id)
+        for user_id in expired:
+            del self._expires[user_id]
+            self._versions.pop(user_id, None)
+            self._revoked.discard(user_id)
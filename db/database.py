@@ -1,9 +1,16 @@
-from contextlib import contextmanager, AbstractContextManager
-from typing import Any, Callable
-from sqlalchemy import create_engine
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager, contextmanager, AbstractContextManager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, scoped_session, sessionmaker, declared_attr
 from sqlalchemy.orm import as_declarative
 
+from logger_config import logger
+
 
 @as_declarative()
 class BaseModel:
@@ -14,9 +21,56 @@ class BaseModel:
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
 
+class PoolMetrics:
+    """Connection checkout wait times (histogram, in seconds) and checkout timeouts."""
+
+    buckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.wait_sum = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.wait_sum += seconds
+        self.checkouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        histogram, cumulative = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            cumulative += count
+            histogram[bound] = cumulative
+        return {
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.timeouts,
+            "wait_seconds_sum": self.wait_sum,
+            "wait_seconds_buckets": histogram,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe(time.perf_counter() - start)
+
+
 class Database:
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_engine(db_url, echo=True)
+    """Synchronous database, kept for migrations and scripts."""
+
+    def __init__(self, db_url: str, echo: bool = False, **pool_options) -> None:
+        self._engine = create_engine(db_url, echo=echo, **pool_options)
         self._session_factory = scoped_session(
             sessionmaker(
                 autocommit=False,
@@ -37,4 +91,125 @@ class Database:
             session.rollback()
             raise
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+
+class AsyncDatabase:
+    """AsyncEngine backed database used by the API (asyncpg / aiosqlite).
+
+    Inside ``unit_of_work()`` every ``session()`` shares one session and the transaction is
+    committed or rolled back once when the unit of work ends; outside of it each
+    ``session()`` is its own short transaction. ``on_commit`` callbacks run after that commit.
+    """
+
+    def __init__(self, db_url: str, echo: bool = False, **pool_options) -> None:
+        self.pool_metrics = PoolMetrics()
+        if pool_options:
+            # a subclass per database so the metrics survive pool.recreate() on dispose
+            pool_options["poolclass"] = type(
+                "InstrumentedAsyncQueuePool", (InstrumentedAsyncQueuePool,), {"metrics": self.pool_metrics}
+            )
+        self._engine = create_async_engine(db_url, echo=echo, **pool_options)
+        self._session_factory = async_sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=self._engine,
+        )
+        self._current_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+            "current_session", default=None
+        )
+        self._commit_callbacks: ContextVar[Optional[List[Callable[[], Awaitable[None]]]]] = ContextVar(
+            "commit_callbacks", default=None
+        )
+
+    async def create_database(self) -> None:
+        async with self._engine.begin() as connection:
+            await connection.run_sync(BaseModel.metadata.create_all)
+
+    async def dispose(self) -> None:
+        await self._engine.dispose()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        pool = self._engine.pool
+        if isinstance(pool, QueuePool):
+            stats = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        else:
+            stats = {"status": pool.status()}
+        return {**stats, **self.pool_metrics.snapshot()}
+
+    async def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run ``callback`` after the current unit of work commits (dropped on rollback).
+
+        Outside of a unit of work the sessions have already committed, so it runs right away.
+        """
+        callbacks = self._commit_callbacks.get()
+        if callbacks is None:
+            await callback()
+        else:
+            callbacks.append(callback)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[AsyncSession]:
+        session: AsyncSession = self._session_factory()
+        callbacks = []
+        token = self._current_session.set(session)
+        callbacks_token = self._commit_callbacks.set(callbacks)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            self._commit_callbacks.reset(callbacks_token)
+            self._current_session.reset(token)
+            await session.close()
+
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                # the transaction is committed, a failing callback must not turn it into an error
+                logger.exception(f"on_commit callback failed: {e}")
+
+    @asynccontextmanager
+    async def autonomous(self) -> AsyncIterator[None]:
+        """Step out of the current unit of work for a long-running block.
+
+        What the unit of work did so far is committed and its connection released; inside the
+        block every ``session()`` is its own short transaction and ``on_commit`` callbacks run
+        right away, so a slow or failing block never rolls back what it already committed.
+        """
+        current = self._current_session.get()
+        if current is not None:
+            await current.commit()
+        token = self._current_session.set(None)
+        callbacks_token = self._commit_callbacks.set(None)
+        try:
+            yield
+        finally:
+            self._commit_callbacks.reset(callbacks_token)
+            self._current_session.reset(token)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        current = self._current_session.get()
+        if current is not None:
+            yield current
+            return
+
+        session: AsyncSession = self._session_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,30 @@
+"""characters filter indexes
+
+Revision ID: 7c2e5d9a41b3
+Revises: 249474083f1a
+Create Date: 2026-10-18 10:12:40.218311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5d9a41b3'
+down_revision: Union[str, None] = '249474083f1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('hair_color', 'skin_color', 'eye_color', 'user_id', 'height', 'mass')
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.create_index(f'ix_characters_{column}_id', 'characters', [column, 'id'], unique=False)
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(f'ix_characters_{column}_id', table_name='characters')
@@ -0,0 +1,54 @@
+"""characters name search
+
+Revision ID: 9f3b1c7e2d54
+Revises: 7c2e5d9a41b3
+Create Date: 2026-10-18 11:40:03.581927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3b1c7e2d54'
+down_revision: Union[str, None] = '7c2e5d9a41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_characters_name_trgm ON characters USING gin (name gin_trgm_ops)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE characters_fts USING fts5("
+            "name, content='characters', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER characters_fts_insert AFTER INSERT ON characters BEGIN "
+            "INSERT INTO characters_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER characters_fts_delete AFTER DELETE ON characters BEGIN "
+            "INSERT INTO characters_fts(characters_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER characters_fts_update AFTER UPDATE OF name ON characters BEGIN "
+            "INSERT INTO characters_fts(characters_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+            "INSERT INTO characters_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        op.execute("INSERT INTO characters_fts(characters_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_characters_name_trgm', table_name='characters')
+    elif dialect == 'sqlite':
+        for trigger in ('characters_fts_insert', 'characters_fts_delete', 'characters_fts_update'):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE characters_fts")
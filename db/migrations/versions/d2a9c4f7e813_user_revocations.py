@@ -0,0 +1,37 @@
+"""user revocations
+
+Revision ID: d2a9c4f7e813
+Revises: b4d81e6f0a27
+Create Date: 2026-10-18 16:42:07.318502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9c4f7e813'
+down_revision: Union[str, None] = 'b4d81e6f0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_revocations',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_revocations_created_at', 'user_revocations', ['created_at'], unique=False)
+    op.create_index(op.f('ix_user_revocations_id'), 'user_revocations', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_revocations_id'), table_name='user_revocations')
+    op.drop_index('ix_user_revocations_created_at', table_name='user_revocations')
+    op.drop_table('user_revocations')
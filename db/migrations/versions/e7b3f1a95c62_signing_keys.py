@@ -0,0 +1,32 @@
+"""signing keys
+
+Revision ID: e7b3f1a95c62
+Revises: d2a9c4f7e813
+Create Date: 2026-10-18 17:20:44.905136
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f1a95c62'
+down_revision: Union[str, None] = 'd2a9c4f7e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'signing_keys',
+        sa.Column('kid', sa.String(), nullable=False),
+        sa.Column('created_at', sa.Integer(), nullable=False),
+        sa.Column('private_key', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('kid')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('signing_keys')
@@ -1,7 +1,14 @@
+import asyncio
+
+from app.api.endpoints.well_known import router as well_known_router
 from app.api.routes import routers as v1_routers
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from httpx import HTTPError
 from config import settings
 from container import Container
+from core.http import provider_error_handler
+from core.metrics import MetricsMiddleware, track_queries
+from core.security import hashing_pool, key_ring
 from starlette.middleware.cors import CORSMiddleware
 
 
@@ -9,17 +16,37 @@ class AppCreator:
     _instance = None
 
     def __init__(self):
+        # set db and container
+        self.container = Container()
+        self.db = self.container.db()
+        # self.db.create_database()
+
+        # one session and transaction per request, shared by every repository
+        async def unit_of_work():
+            async with self.db.unit_of_work():
+                yield
+
         # set app default
         self.app = FastAPI(
             title=settings.project_name,
             openapi_url=f"{settings.api}/openapi.json",
             version="0.0.1",
+            dependencies=[Depends(unit_of_work)],
         )
+        # signing keys are loaded before serving, then reloaded and rotated off the request path
+        async def start_key_ring():
+            await key_ring.start(self.container.key_store())
+            self.key_refresh = asyncio.ensure_future(key_ring.run())
 
-        # set db and container
-        self.container = Container()
-        self.db = self.container.db()
-        # self.db.create_database()
+        async def stop_key_ring():
+            self.key_refresh.cancel()
+
+        self.app.add_event_handler("startup", start_key_ring)
+        self.app.add_event_handler("shutdown", stop_key_ring)
+        self.app.add_event_handler("shutdown", self.db.dispose)
+        self.app.add_event_handler("shutdown", hashing_pool.shutdown)
+        self.app.add_event_handler("shutdown", self.container.http_client().aclose)
+        self.app.add_exception_handler(HTTPError, provider_error_handler)
 
         # set cors
         if settings.backend_cors_origins:
@@ -38,6 +65,13 @@ class AppCreator:
             return f"API: {settings.project_name} is working"
 
         self.app.include_router(v1_routers, prefix=settings.prefix)
+        # served at the root, where token verifiers look for it
+        self.app.include_router(well_known_router)
+
+        # set metrics, outermost so the latency covers every other middleware
+        if settings.metrics_enabled:
+            track_queries(self.db._engine.sync_engine)
+            self.app.add_middleware(MetricsMiddleware, metrics=self.container.metrics())
 
     def __new__(cls):
         if cls._instance is None:
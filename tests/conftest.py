@@ -58,7 +58,7 @@ def auth_token(client):
         "email": "julian.clark@gmail.com",
         "password": "dolor"
     }
-    response = client.post("/api/v1/auth/sign-in", json=auth_data)
+    response = client.post("/api/v1/auth/signin", json=auth_data)
     assert response.status_code == 200
     token = response.json().get("access_token")
 
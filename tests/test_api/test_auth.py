@@ -0,0 +1,38 @@
+import pytest
+from dependency_injector import providers
+
+from config import settings
+from core.rate_limit import Limit, MemoryRateLimitBackend, RateLimiter
+from main import AppCreator
+
+
+def test_introspect_batch(create_user, auth_token, client, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_key", "internal")
+    headers = {"X-Internal-Key": "internal"}
+    assert client.post("/api/v1/auth/introspect", json={"tokens": [auth_token]}).status_code == 404
+
+    response = client.post("/api/v1/auth/introspect", json={"tokens": [auth_token, "garbage", auth_token]},
+                           headers=headers)
+    assert response.status_code == 200
+    active, invalid, repeated = response.json()
+    assert active["active"] and active["claims"]["username"] == "delicatesilk"
+    assert invalid == {"active": False, "exp": None, "claims": None}
+    assert repeated == active
+
+    client.headers["Authorization"] = f"Bearer {auth_token}"
+    assert client.delete(f"/api/v1/users/{create_user.id}").status_code == 200
+    response = client.post("/api/v1/auth/introspect", json={"tokens": [auth_token]}, headers=headers)
+    assert response.json() == [{"active": False, "exp": None, "claims": None}]
+
+
+def test_sign_in_rate_limited_before_hashing(create_user, client, monkeypatch):
+    limiter = RateLimiter(MemoryRateLimitBackend(maxsize=10), "auth", {"email": Limit(rate=1, burst=1)})
+    container = AppCreator._instance.container  # the one wired by the client fixture
+    with container.auth_rate_limiter.override(providers.Object(limiter)):
+        credentials = {"email": "julian.clark@gmail.com", "password": "dolor"}
+        assert client.post("/api/v1/auth/signin", json=credentials).status_code == 200
+
+        monkeypatch.setattr("core.services.auth_service.verify_password_async", pytest.fail)
+        response = client.post("/api/v1/auth/signin", json=credentials)
+        assert response.status_code == 429
+        assert 0 < int(response.headers["retry-after"]) <= 60
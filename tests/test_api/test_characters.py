@@ -0,0 +1,193 @@
+import csv
+import io
+import json
+
+from pydantic import TypeAdapter
+
+from config import settings
+from core.schema.base_schema import Page
+from core.schema.character_schema import Character
+
+
+CHARACTER = {
+    "name": "Luke Skywalker",
+    "height": 172,
+    "mass": 77,
+    "hair_color": "blond",
+    "skin_color": "fair",
+    "eye_color": "blue",
+}
+
+
+def test_create_and_read_character(create_user, req):
+    response = req.post("/api/v1/characters", json=CHARACTER)
+    assert response.status_code == 200
+    character_id = response.json()["id"]
+
+    response = req.get(f"/api/v1/characters/{character_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == CHARACTER["name"]
+
+    response = req.patch(f"/api/v1/characters/{character_id}", json={**CHARACTER, "eye_color": "green"})
+    assert response.status_code == 200
+    assert response.json()["eye_color"] == "green"
+    assert req.get(f"/api/v1/characters/{character_id}").json()["eye_color"] == "green"
+
+    response = req.get("/api/v1/characters")
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()["items"]] == [character_id]
+    assert response.json()["next_cursor"] is None
+
+
+def test_conditional_get(create_user, req):
+    character_id = req.post("/api/v1/characters", json=CHARACTER).json()["id"]
+
+    response = req.get(f"/api/v1/characters/{character_id}")
+    etag = response.headers["etag"]
+    response = req.get(f"/api/v1/characters/{character_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    list_etag = req.get("/api/v1/characters").headers["etag"]
+    assert req.get("/api/v1/characters", headers={"If-None-Match": f'W/{list_etag}'}).status_code == 304
+    req.post("/api/v1/characters", json={**CHARACTER, "name": "Leia Organa"})
+    response = req.get("/api/v1/characters", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != list_etag
+
+
+def test_list_matches_schema_serialization(create_user, req):
+    req.post("/api/v1/characters", json=CHARACTER)
+    req.post("/api/v1/characters", json={**CHARACTER, "name": "Leia Organa", "height": 150.5})
+
+    response = req.get("/api/v1/characters")
+    assert response.headers["content-type"] == "application/json"
+    adapter = TypeAdapter(Page[Character])
+    assert adapter.dump_json(adapter.validate_json(response.content)) == response.content
+
+
+def test_list_characters_by_cursor(create_user, req):
+    ids = [
+        req.post("/api/v1/characters", json={**CHARACTER, "name": f"Clone {i}"}).json()["id"]
+        for i in range(5)
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = req.get("/api/v1/characters", params=params).json()
+        seen += [c["id"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == ids
+    assert req.get("/api/v1/characters", params={"cursor": "!!"}).status_code == 400
+
+
+def test_filter_and_sort_characters(create_user, req):
+    for i, (hair_color, height) in enumerate([("blond", 172), ("brown", 150), ("blond", 183), ("blond", 96)]):
+        req.post("/api/v1/characters", json={**CHARACTER, "name": f"C{i}", "hair_color": hair_color, "height": height})
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 1, "min_height": 100, "max_height": 180, "sort": "-height"}
+        page = req.get("/api/v1/characters", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        seen += [(c["name"], c["height"]) for c in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [("C0", 172), ("C1", 150)]
+    blond = req.get("/api/v1/characters", params={"hair_color": "blond", "sort": "-id"}).json()["items"]
+    assert [c["name"] for c in blond] == ["C3", "C2", "C0"]
+
+    assert req.get("/api/v1/characters", params={"sort": "hair_color"}).status_code == 422
+    # combinations no single index serves in keyset order would scan unboundedly
+    for params in [{"hair_color": "blond", "sort": "-height"}, {"hair_color": "blond", "eye_color": "blue"},
+                   {"hair_color": "blond", "min_height": 100}, {"min_height": 100, "min_mass": 50, "sort": "height"},
+                   {"min_mass": 50}]:
+        assert req.get("/api/v1/characters", params=params).status_code == 422
+    assert req.get("/api/v1/characters", params={"sort": "height", "cursor": cursor or "MQ"}).status_code == 400
+
+
+def test_search_characters(create_user, req):
+    for name in ["Luke Skywalker", "Anakin Skywalker", "Leia Organa", "Lukas Sky"]:
+        req.post("/api/v1/characters", json={**CHARACTER, "name": name})
+
+    response = req.get("/api/v1/characters/search", params={"q": "luk"})
+    assert response.status_code == 200
+    assert {c["name"] for c in response.json()} == {"Luke Skywalker", "Lukas Sky"}
+
+    names = [c["name"] for c in req.get("/api/v1/characters/search", params={"q": "skywalker"}).json()]
+    assert set(names[:2]) == {"Luke Skywalker", "Anakin Skywalker"}
+    assert len(req.get("/api/v1/characters/search", params={"q": "sky", "limit": 1}).json()) == 1
+
+    character = req.get("/api/v1/characters/search", params={"q": "Leia"}).json()[0]
+    req.patch(f"/api/v1/characters/{character['id']}", json={**CHARACTER, "name": "Princess Leia"})
+    assert req.get("/api/v1/characters/search", params={"q": "Princ"}).json()[0]["id"] == character["id"]
+    assert req.get("/api/v1/characters/search", params={"q": "lu"}).status_code == 422
+
+
+def test_bulk_create_update_delete(create_user, req):
+    existing = req.post("/api/v1/characters", json={**CHARACTER, "name": "Leia Organa"}).json()
+    payload = [
+        {**CHARACTER, "name": "Han Solo"},
+        {**CHARACTER, "name": "Leia Organa"},
+        {**CHARACTER, "name": "Chewbacca"},
+        {**CHARACTER, "name": "Han Solo"},
+    ]
+
+    result = req.post("/api/v1/characters/bulk", json=payload).json()
+    assert (result["succeeded"], result["failed"]) == (2, 2)
+    assert [item["error"] is None for item in result["items"]] == [True, False, True, False]
+    han_id, chewie_id = result["items"][0]["id"], result["items"][2]["id"]
+
+    payload = [
+        {**CHARACTER, "id": han_id, "name": "Han Solo", "hair_color": "brown"},
+        {**CHARACTER, "id": chewie_id, "name": "Leia Organa"},
+        {**CHARACTER, "id": 9999, "name": "Nobody"},
+    ]
+    result = req.patch("/api/v1/characters/bulk", json=payload).json()
+    assert (result["succeeded"], result["failed"]) == (1, 2)
+    assert req.get(f"/api/v1/characters/{han_id}").json()["hair_color"] == "brown"
+
+    result = req.request("DELETE", "/api/v1/characters/bulk", json=[han_id, existing["id"], 9999]).json()
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+    assert [c["id"] for c in req.get("/api/v1/characters").json()["items"]] == [chewie_id]
+
+
+def test_export_characters(create_user, req):
+    names = ["Yoda", "Obi-Wan Kenobi"]
+    req.post("/api/v1/characters/bulk", json=[{**CHARACTER, "name": name} for name in names])
+
+    response = req.get("/api/v1/characters/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == names
+
+    response = req.get("/api/v1/characters/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == names
+
+
+def test_import_characters(create_user, req, monkeypatch):
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    req.post("/api/v1/characters", json={**CHARACTER, "name": "Yoda"})
+    header = "name,height,mass,hair_color,skin_color,eye_color"
+    body = "\n".join([
+        header,
+        "R2-D2,96,32,n/a,white,red",
+        "Yoda,66,17,white,green,brown",
+        "C-3PO,167,not-a-number,n/a,gold,yellow",
+        "Darth Vader,202,136,none,white,yellow",
+        "R2-D2,96,32,n/a,white,red",
+    ])
+
+    response = req.post("/api/v1/characters/import", params={"format": "csv"}, content=body.encode())
+    result = response.json()
+    assert (result["processed"], result["inserted"], result["rejected"]) == (5, 2, 3)
+    assert sorted(reject["line"] for reject in result["rejects"]) == [3, 4, 6]
+
+    response = req.post("/api/v1/characters/import", content=b'{"name": "Rey"}\nnot json\n')
+    assert response.json()["rejected"] == 2
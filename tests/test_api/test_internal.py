@@ -0,0 +1,34 @@
+from config import settings
+
+
+def test_internal_endpoints_hidden_without_key(client):
+    assert client.get("/api/v1/internal/db/pool").status_code == 404
+
+
+def test_db_pool_stats(create_user, req, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_key", "internal")
+    assert req.get("/api/v1/users").status_code == 200
+
+    response = req.get("/api/v1/internal/db/pool", headers={"X-Internal-Key": "internal"})
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["size"] == settings.db_pool_size
+    assert stats["checkouts"] >= 1
+    assert stats["wait_seconds_buckets"]["+Inf"] == stats["checkouts"]
+
+
+def test_metrics(create_user, req, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_key", "internal")
+    assert req.get("/api/v1/users/1").status_code == 200
+
+    response = req.get("/api/v1/internal/metrics", headers={"X-Internal-Key": "internal"})
+    assert response.status_code == 200
+    text = response.text
+    route = 'method="GET",route="/api/v1/users/{id}"'
+    assert f'http_requests_total{{{route},status="200"}} 1' in text
+    assert f"http_request_duration_seconds_count{{{route}}} 1" in text
+    # the first token version poll and the user lookup
+    assert f'http_request_db_queries_bucket{{{route},le="1"}} 0' in text
+    assert "http_requests_in_flight 1" in text
+    assert "db_pool_checkout_wait_seconds_count" in text
+    assert 'cache_hit_ratio{cache="verified_tokens"}' in text
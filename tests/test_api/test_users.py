@@ -1,6 +1,88 @@
+from dependency_injector import providers
 
+from config import settings
+from core.cache import MemoryCacheBackend
+from core.token_versions import TokenVersions
+from main import AppCreator
 
 
 def test_read_item(create_user, req):
     response = req.get("/api/v1/users")
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+
+def test_read_user_not_modified(create_user, req):
+    etag = req.get(f"/api/v1/users/{create_user.id}").headers["etag"]
+    response = req.get(f"/api/v1/users/{create_user.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_users_list_etag_changes_after_sign_up(create_user, req):
+    etag = req.get("/api/v1/users").headers["etag"]
+    assert req.get("/api/v1/users", headers={"If-None-Match": etag}).status_code == 304
+
+    user = {"email": "leia@rebels.test", "password": "dolor", "username": "leia", "first_name": "Leia",
+            "last_name": "Organa"}
+    assert req.post("/api/v1/auth/signup", json=user).status_code == 200
+    response = req.get("/api/v1/users", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+def test_users_list_etag_changes_on_every_worker(create_user, req):
+    container = AppCreator._instance.container
+    other_worker = providers.Object(MemoryCacheBackend(maxsize=10, ttl=settings.cache_ttl))
+    with container.cache_backend.override(other_worker):
+        etag = req.get("/api/v1/users").headers["etag"]
+
+    user = {"email": "julian.clark@gmail.com", "username": "delicatesilk", "first_name": "Jules", "last_name": "Clark"}
+    assert req.patch(f"/api/v1/users/{create_user.id}", json=user).status_code == 200
+
+    # the write was served by this worker; the other one must not answer 304 with its old page
+    with container.cache_backend.override(other_worker):
+        response = req.get("/api/v1/users", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["first_name"] == "Jules"
+
+
+def test_outdated_and_revoked_tokens(create_user, req):
+    user = {"email": "julian.clark@gmail.com", "username": "delicatesilk", "first_name": "Jules", "last_name": "Clark"}
+    response = req.patch(f"/api/v1/users/{create_user.id}", json=user)
+    assert response.status_code == 200
+
+    # the token still carries first_name "Julian"; the principal now comes from the users row
+    character = {"name": "Obi-Wan", "height": 182, "mass": 77, "hair_color": "auburn", "skin_color": "fair",
+                 "eye_color": "blue-gray"}
+    assert req.post("/api/v1/characters", json=character).status_code == 200
+
+    assert req.delete(f"/api/v1/users/{create_user.id}").status_code == 200
+    assert req.get("/api/v1/users").status_code == 401
+
+
+def test_deleted_user_revoked_on_every_worker(create_user, req, monkeypatch):
+    token = req.headers["Authorization"].removeprefix("Bearer ")
+    assert req.get("/api/v1/characters").status_code == 200
+    assert req.delete(f"/api/v1/users/{create_user.id}").status_code == 200
+
+    # another worker, or this one after a restart, starts from an empty map and learns of the
+    # delete from the tombstone
+    container = AppCreator._instance.container
+    with container.token_versions.override(providers.Object(TokenVersions(sync_interval=5, token_lifetime=settings.access_token_expire))):
+        assert req.get("/api/v1/characters").status_code == 401
+        assert req.post("/api/v1/characters", json={"name": "Obi-Wan", "height": 182, "mass": 77,
+                                                     "hair_color": "auburn", "skin_color": "fair",
+                                                     "eye_color": "blue-gray"}).status_code == 401
+
+        monkeypatch.setattr(settings, "internal_api_key", "internal")
+        response = req.post("/api/v1/auth/introspect", json={"tokens": [token]},
+                            headers={"X-Internal-Key": "internal"})
+        assert response.json() == [{"active": False, "exp": None, "claims": None}]
+
+
+def test_export_users_omits_password(create_user, req):
+    response = req.get("/api/v1/users/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.text.splitlines() == [
+        "email,username,first_name,last_name",
+        "julian.clark@gmail.com,delicatesilk,Julian,Clark",
+    ]
@@ -0,0 +1,12 @@
+import jwt
+
+
+def test_jwks_verifies_issued_tokens(create_user, auth_token, client):
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    assert "max-age" in response.headers["cache-control"]
+
+    header = jwt.get_unverified_header(auth_token)
+    jwk = next(key for key in response.json()["keys"] if key["kid"] == header["kid"])
+    public_key = jwt.PyJWK(jwk).key
+    assert jwt.decode(auth_token, public_key, algorithms=[jwk["alg"]])["email"] == "julian.clark@gmail.com"
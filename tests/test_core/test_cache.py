@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from pydantic import TypeAdapter
+
+from core.cache import LRUCache, MemoryCacheBackend, ReadThroughCache, RedisCacheBackend
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=0.01)
+    cache.set("long", 2)
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.mark.parametrize("backend", [MemoryCacheBackend(maxsize=10, ttl=60), RedisCacheBackend(FakeRedis())])
+def test_read_through_cache_invalidates_after_commit(backend):
+    adapter = TypeAdapter(dict)
+    pending = []
+
+    async def on_commit(callback):
+        pending.append(callback)
+
+    async def scenario():
+        cache = ReadThroughCache(backend, "test", ttl=60, on_commit=on_commit)
+        version = {"value": 1}
+
+        async def load():
+            return dict(version)
+
+        async def load_json():
+            return adapter.dump_json(version)
+
+        assert await cache.get("id:1", adapter, load) == {"value": 1}
+        assert await cache.get_list_json("page", load_json) == b'{"value":1}'
+        version["value"] = 2
+        assert await cache.get("id:1", adapter, load) == {"value": 1}
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        await cache.invalidate("id:1")
+        assert await cache.get("id:1", adapter, load) == {"value": 1}
+        for callback in pending:
+            await callback()
+        assert await cache.get("id:1", adapter, load) == {"value": 2}
+        assert await cache.get_list_json("page", load_json) == b'{"value":2}'
+
+    asyncio.run(scenario())
+
+
+def test_value_loaded_across_an_invalidation_is_not_served():
+    adapter = TypeAdapter(dict)
+
+    async def on_commit(callback):
+        await callback()
+
+    async def scenario():
+        cache = ReadThroughCache(MemoryCacheBackend(maxsize=10, ttl=60), "test", ttl=60, on_commit=on_commit)
+        loading, committed = asyncio.Event(), asyncio.Event()
+
+        async def stale_load():
+            loading.set()
+            await committed.wait()
+            return {"value": 1}
+
+        async def load():
+            return {"value": 2}
+
+        reader = asyncio.ensure_future(cache.get("id:1", adapter, stale_load))
+        await loading.wait()
+        await cache.invalidate("id:1")  # the writer commits while the reader awaits the old row
+        committed.set()
+        assert await reader == {"value": 1}
+        assert await cache.get("id:1", adapter, load) == {"value": 2}
+
+    asyncio.run(scenario())
@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from core.cache import LRUCache
+from core.http import ProviderClient
+from core.services.oauth_service import GitHubOAuthService
+
+USER_INFO_URL = "https://api.github.test/user"
+
+
+def github_service(handler):
+    client = ProviderClient(
+        "github", httpx.AsyncClient(transport=httpx.MockTransport(handler)), connect_timeout=1,
+        read_timeout=1, max_retries=0, backoff_base=0, backoff_max=0, failure_threshold=5, reset_timeout=30,
+    )
+    return GitHubOAuthService(
+        auth_url="https://github.test/authorize", user_info_url=USER_INFO_URL,
+        profile_cache=LRUCache(maxsize=10, ttl=60), lookup_budget=1, client_id="id", client_secret="secret",
+        redirect_uri="http://localhost/callback", token_url="https://github.test/token",
+        access_token_expire=30, user_repository=None, http_client=client,
+    )
+
+
+def test_profile_and_emails_are_fetched_concurrently_and_cached():
+    in_flight, calls = [], []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        in_flight.append(request.url.path)
+        await asyncio.sleep(0.05)
+        assert len(in_flight) == 2
+        if request.url.path.endswith("/emails"):
+            return httpx.Response(200, json=[{"email": "leia@rebels.test", "primary": True, "verified": True}])
+        return httpx.Response(200, json={"login": "leia", "name": "Leia Organa", "email": None})
+
+    service = github_service(handler)
+
+    async def run():
+        return await service._get_profile("token"), await service._get_profile("token")
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert first[1] == "leia@rebels.test"
+    assert len(calls) == 2
+
+
+def test_unreachable_emails_endpoint_does_not_abort_login():
+    async def handler(request):
+        if request.url.path.endswith("/emails"):
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"login": "leia", "name": "Leia Organa", "email": "leia@rebels.test"})
+
+    user_info, email = asyncio.run(github_service(handler)._get_profile("token"))
+    assert user_info["login"] == "leia"
+    assert email == "leia@rebels.test"
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.http import ProviderClient, ProviderUnavailableError
+
+
+def provider(handler, **kwargs):
+    options = dict(connect_timeout=1, read_timeout=1, max_retries=2, backoff_base=0, backoff_max=0,
+                   failure_threshold=3, reset_timeout=60)
+    options.update(kwargs)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ProviderClient("test", client, **options)
+
+
+def test_get_retries_server_errors():
+    statuses = [503, 502, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0))
+
+    response = asyncio.run(provider(handler).get("https://provider.test/user"))
+    assert response.status_code == 200
+    assert statuses == []
+
+
+def test_post_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    response = asyncio.run(provider(handler).post("https://provider.test/token"))
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+def test_circuit_opens_after_consecutive_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("down", request=request)
+
+    client = provider(handler, max_retries=0, failure_threshold=2)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://provider.test/user")
+        with pytest.raises(ProviderUnavailableError):
+            await client.get("https://provider.test/user")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert client.breaker.state == "open"
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import httpx
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import algorithms
+
+from core.jwks import JWKSCache
+
+JWKS_URL = "https://provider.test/certs"
+
+
+def jwks_client(calls, kid="key-1", status_code=200):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key()
+    jwk = json.loads(algorithms.RSAAlgorithm.to_jwk(key))
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(
+            status_code,
+            json={"keys": [{**jwk, "kid": kid}]},
+            headers={"Cache-Control": "public, max-age=3600"},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_concurrent_lookups_share_one_fetch():
+    calls = []
+    cache = JWKSCache(JWKS_URL, jwks_client(calls))
+
+    async def run():
+        keys = await asyncio.gather(*[cache.get_key("key-1") for _ in range(10)])
+        await cache.get_key("key-1")
+        return keys
+
+    keys = asyncio.run(run())
+    assert all(key is not None for key in keys)
+    assert len(calls) == 1
+
+
+def test_unknown_kid_refresh_is_rate_limited():
+    calls = []
+    cache = JWKSCache(JWKS_URL, jwks_client(calls), min_refresh_interval=60)
+
+    async def run():
+        await cache.get_key("key-1")
+        return await cache.get_key("other"), await cache.get_key("other")
+
+    assert asyncio.run(run()) == (None, None)
+    assert len(calls) == 1
+
+
+def test_stale_keys_survive_provider_errors():
+    calls = []
+    cache = JWKSCache(JWKS_URL, jwks_client(calls))
+
+    async def run():
+        key = await cache.get_key("key-1")
+        cache.http_client = jwks_client(calls, status_code=503)
+        cache._expires_at = 0
+        return key, await cache.get_key("key-1")
+
+    key, stale = asyncio.run(run())
+    assert stale is key
+    assert len(calls) == 2
@@ -0,0 +1,61 @@
+import asyncio
+
+import jwt
+import pytest
+
+from core.keys import DatabaseKeyStore, DirectoryKeyStore, KeyRing
+from db.database import AsyncDatabase
+
+DAY = 60 * 60 * 24
+NOW = 1_700_000_000.0
+
+
+def make_ring(algorithm="RS256"):
+    return KeyRing(algorithm=algorithm, rotation_interval=7 * DAY, activation_delay=300, retention=30 * DAY)
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_replicas_share_keys_through_the_database(algorithm, tmp_path):
+    async def run():
+        db = AsyncDatabase(f"sqlite+aiosqlite:///{tmp_path / 'keys.db'}")
+        await db.create_database()
+        signer, verifier = make_ring(algorithm), make_ring(algorithm)
+        # both replicas start at once, with no key stored yet
+        await asyncio.gather(signer.start(DatabaseKeyStore(db.session, "secret")),
+                             verifier.start(DatabaseKeyStore(db.session, "secret")))
+        await db.dispose()
+        return signer, verifier
+
+    signer, verifier = asyncio.run(run())
+    key = signer.signing_key()
+    assert verifier.signing_key().kid == key.kid
+    token = jwt.encode({"id": 1}, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    public = verifier.verification_key(jwt.get_unverified_header(token)["kid"])
+    assert jwt.decode(token, public.public_key, algorithms=[public.algorithm]) == {"id": 1}
+    assert [jwk["kid"] for jwk in verifier.jwks()["keys"]] == [key.kid]
+
+
+def test_rotation_publishes_before_signing_and_retires_after_retention(tmp_path):
+    ring, other = make_ring("EdDSA"), make_ring("EdDSA")
+
+    async def run():
+        store = DirectoryKeyStore(str(tmp_path))
+        ring.store, other.store = store, store
+        await ring.refresh(NOW)
+        first = ring.signing_key()
+
+        await asyncio.gather(ring.refresh(NOW + 8 * DAY), other.refresh(NOW + 8 * DAY))
+        assert len(ring.jwks()["keys"]) == 2  # both replicas rotated into the same new key
+        assert ring.signing_key() is first  # the new key is published but not signing yet
+
+        await ring.refresh(NOW + 8 * DAY + 300)
+        second = ring.signing_key()
+        assert second.kid != first.kid
+        assert ring.verification_key(first.kid) is not None
+
+        await ring.refresh(NOW + 39 * DAY)
+        assert ring.verification_key(first.kid) is None
+        assert len(list(tmp_path.iterdir())) == len(ring.jwks()["keys"])
+
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from core.rate_limit import Limit, MemoryRateLimitBackend, RateLimiter
+
+
+def test_buckets_refill_and_reject_together(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("core.rate_limit.time.monotonic", lambda: now)
+    limiter = RateLimiter(MemoryRateLimitBackend(maxsize=100), "auth", {
+        "ip": Limit(rate=60, burst=3), "email": Limit(rate=6, burst=2), "user": Limit(rate=0, burst=0),
+    })
+
+    async def attempt(ip, email):
+        try:
+            await limiter.check(ip=ip, email=email, user="ignored")
+        except HTTPException as e:
+            assert e.status_code == 429
+            return int(e.headers["Retry-After"])
+        return 0
+
+    assert asyncio.run(attempt("10.0.0.1", "julian@example.com")) == 0
+    assert asyncio.run(attempt("10.0.0.1", "JULIAN@example.com ")) == 0
+    assert asyncio.run(attempt("10.0.0.1", "julian@example.com")) == 10  # email bucket is empty
+    # the rejected attempt spent no token from the IP bucket
+    assert asyncio.run(attempt("10.0.0.1", "obiwan@example.com")) == 0
+    assert asyncio.run(attempt("10.0.0.1", "leia@example.com")) == 1
+
+    now += 10
+    assert asyncio.run(attempt("10.0.0.2", "julian@example.com")) == 0
+    assert limiter.rejected == 2
+
+
+def test_disabled_limits_skip_the_backend():
+    class Backend:
+        async def hit(self, buckets):
+            pytest.fail("backend called")
+
+    limiter = RateLimiter(Backend(), "auth", {"ip": Limit(rate=0, burst=0)})
+    asyncio.run(limiter.check(ip="10.0.0.1"))
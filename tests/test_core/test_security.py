@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from core.keys import DirectoryKeyStore
+from core.security import (
+    HashingPool, JWTBearer, VerifiedTokens, create_access_token, get_password_hash, hashing_pool, key_ring,
+    verify_password_async
+)
+
+
+@pytest.fixture
+def signing_keys(tmp_path):
+    asyncio.run(key_ring.start(DirectoryKeyStore(str(tmp_path))))
+
+
+def test_verify_password_async():
+    hashed = get_password_hash("dolor")
+    try:
+        assert asyncio.run(verify_password_async("dolor", hashed))
+        assert not asyncio.run(verify_password_async("lorem", hashed))
+    finally:
+        hashing_pool.shutdown()
+
+
+def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(executor="thread", max_workers=1, queue_size=0)
+
+    async def run():
+        slow = asyncio.ensure_future(pool.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(time.sleep, 0)
+        await slow
+        return exc.value
+
+    try:
+        assert asyncio.run(run()).status_code == 503
+    finally:
+        pool.shutdown()
+
+
+def test_bearer_verifies_token_once_per_request(signing_keys):
+    token, _ = create_access_token({"id": 1, "email": "julian.clark@gmail.com", "first_name": "Julian"})
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+    bearer = JWTBearer()
+
+    payload = asyncio.run(bearer(request))
+    assert payload.id == 1
+    assert request.state.token_payload is payload
+    assert asyncio.run(bearer(request)) is payload
+
+
+def test_verified_tokens_parse_once_until_exp(signing_keys, monkeypatch):
+    tokens = VerifiedTokens(maxsize=10)
+    token, _ = create_access_token({"id": 1, "email": "julian.clark@gmail.com"})
+    claims = tokens.decode(token)
+    assert claims.id == 1
+    assert not tokens.decode(token[:-2])
+    assert len(tokens.cache) == 1
+
+    monkeypatch.setattr("core.security.decode_jwt", lambda token: pytest.fail("verified twice"))
+    assert tokens.decode(token) is claims
+    assert tokens.cache.stats()["hits"] == 1
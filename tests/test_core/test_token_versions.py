@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from core.token_versions import SYNC_OVERLAP, TokenVersions
+
+
+def test_token_versions_sync_from_changes():
+    versions = TokenVersions(sync_interval=60, token_lifetime=60)
+    now = datetime(2026, 1, 1, 12, 0)
+    calls = []
+
+    async def load_changes(since):
+        calls.append(since)
+        return now, [(1, 2, now), (2, 1, now - timedelta(seconds=5))]
+
+    asyncio.run(versions.sync(load_changes))
+    asyncio.run(versions.sync(load_changes))
+
+    assert calls == [None]
+    assert versions.is_current(3, 0)
+    assert versions.is_current(1, 2)
+    assert not versions.is_current(1, 1)
+
+    versions._next_sync = 0
+    asyncio.run(versions.sync(load_changes))
+    assert calls[-1] == now - SYNC_OVERLAP
+
+    versions.revoke(2)
+    assert not versions.is_current(2, 5)
+
+
+def test_token_versions_sync_revokes_deleted_users():
+    versions = TokenVersions(sync_interval=60, token_lifetime=60)
+    now = datetime(2026, 1, 1, 12, 0)
+
+    async def load_changes(since):
+        return now, [(1, 2, now), (1, None, now)]
+
+    asyncio.run(versions.sync(load_changes))
+    assert versions.is_revoked(1)
+    assert not versions.is_current(1, 2)
+
+
+def test_token_versions_advance_without_changes_and_prune(monkeypatch):
+    versions = TokenVersions(sync_interval=60, token_lifetime=60)
+    clock = datetime(2026, 1, 1, 12, 0)
+    calls = []
+
+    async def load_changes(since):
+        calls.append(since)
+        return clock, []
+
+    asyncio.run(versions.sync(load_changes))
+    versions._next_sync = 0
+    asyncio.run(versions.sync(load_changes))
+    assert calls == [None, clock - SYNC_OVERLAP]
+
+    versions.record(1, 2)
+    versions.revoke(2)
+    assert len(versions) == 2
+
+    # every token issued before the changes has expired a retention later
+    monotonic = versions._expires[2] + 1
+    monkeypatch.setattr("core.token_versions.time.monotonic", lambda: monotonic)
+    asyncio.run(versions.sync(load_changes))
+    assert len(versions) == 0
+    assert not versions.is_revoked(2)
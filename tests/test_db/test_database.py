@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from core.models.user import User
+from db.database import AsyncDatabase
+
+
+def make_user(email):
+    return User(email=email, username=email.split("@")[0], first_name="Julian", last_name="Clark")
+
+
+def test_unit_of_work_shares_one_session_and_rolls_back():
+    async def run():
+        db = AsyncDatabase("sqlite+aiosqlite://")
+        await db.create_database()
+
+        async with db.unit_of_work() as uow:
+            async with db.session() as first, db.session() as second:
+                assert first is second is uow
+                first.add(make_user("julian.clark@gmail.com"))
+
+        with pytest.raises(RuntimeError):
+            async with db.unit_of_work():
+                async with db.session() as session:
+                    session.add(make_user("other@gmail.com"))
+                    await session.flush()
+                raise RuntimeError
+
+        async with db.session() as session:
+            count = await session.scalar(select(func.count()).select_from(User))
+        await db.dispose()
+        return count
+
+    assert asyncio.run(run()) == 1
+
+
+def test_autonomous_block_commits_independently_of_the_unit_of_work():
+    async def run():
+        db = AsyncDatabase("sqlite+aiosqlite://")
+        await db.create_database()
+
+        with pytest.raises(RuntimeError):
+            async with db.unit_of_work():
+                async with db.session() as session:
+                    session.add(make_user("before@gmail.com"))
+                async with db.autonomous():
+                    async with db.session() as first:
+                        first.add(make_user("chunk@gmail.com"))
+                    async with db.session() as second:
+                        assert second is not first
+                raise RuntimeError
+
+        async with db.session() as session:
+            emails = set(await session.scalars(select(User.email)))
+        await db.dispose()
+        return emails
+
+    assert asyncio.run(run()) == {"before@gmail.com", "chunk@gmail.com"}